@@ -6,54 +6,337 @@ Extracted to avoid import conflicts with st.set_page_config()
 import streamlit as st
 import tempfile
 import os
+import gzip
+import mimetypes
+from io import BytesIO
+import orjson
+from html import escape
+from itertools import groupby
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
 from datetime import timedelta
-from src.services.transcription_service import TranscriptionService
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from google.cloud import storage
+from google.cloud.storage import transfer_manager
+from google.oauth2 import service_account
 from src.models.transcription import TranscriptionResponse
-from gemini_service import get_gemini_analyzer
+
+# Slice size for concurrent ranged audio downloads (same idea as `gcloud storage cp` sliced downloads)
+AUDIO_DOWNLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+AUDIO_DOWNLOAD_MAX_WORKERS = 8
+
+# Preferred audio file names, in priority order - WAV files first
+COMMON_AUDIO_FILES = [
+    "recording.wav", "audio.wav",  # WAV files first
+    "recording.ogg", "audio.ogg",  # OGG files
+    "recording.mp3", "audio.mp3"   # MP3 files
+]
+# Any other audio file is picked by extension, in priority order
+AUDIO_EXTENSIONS = ('wav', 'ogg', 'mp3', 'm4a', 'flac', 'aac', 'wma', 'opus')
+AUDIO_EXTENSION_RANK = {ext: rank for rank, ext in enumerate(AUDIO_EXTENSIONS)}
+# Playback MIME types by audio file extension
+AUDIO_MIME_TYPES = {'wav': 'audio/wav', 'ogg': 'audio/ogg', 'mp3': 'audio/mpeg'}
+
+# Transcriptions and analyses kept in session_state - two entries per session
+SESSION_RESULTS_LIMIT = 32
+
+# Colors for different speakers
+SPEAKER_COLORS = {
+    "speaker1": "#4CAF50",  # Green
+    "speaker2": "#2196F3",  # Blue
+    "speaker3": "#FF9800",  # Orange
+    "speaker4": "#9C27B0",  # Purple
+    "speaker5": "#F44336",  # Red
+}
+
+def remember_session_result(key, value):
+    """Store a transcription or analysis in session_state, evicting the oldest ones
+    
+    Only the SESSION_RESULTS_LIMIT most recently stored results are kept, so browsing
+    many sessions doesn't grow memory without bound. Evicted results are reloaded from
+    GCS by the tabs that show them and, for transcriptions, by analyze_transcription_with_gemini.
+    """
+    stored_keys = st.session_state.setdefault("_session_result_keys", OrderedDict())
+    st.session_state[key] = value
+    stored_keys[key] = None
+    stored_keys.move_to_end(key)
+    while len(stored_keys) > SESSION_RESULTS_LIMIT:
+        evicted_key, _ = stored_keys.popitem(last=False)
+        st.session_state.pop(evicted_key, None)
+
+@st.cache_resource
+def get_sessions_bucket():
+    """Get the sessions bucket on a GCS client shared across reruns and sessions"""
+    # Create credentials from service account info in secrets
+    if "gcp_service_account" in st.secrets:
+        credentials = service_account.Credentials.from_service_account_info(
+            st.secrets["gcp_service_account"]
+        )
+        client = storage.Client(
+            credentials=credentials,
+            project=st.secrets["gcs"]["GOOGLE_CLOUD_PROJECT"] if "gcs" in st.secrets else "voting-2024"
+        )
+    else:
+        # Fallback - try without explicit credentials (won't work on Streamlit Cloud)
+        client = storage.Client()
+    
+    return client.bucket(st.secrets["gcs"]["GCS_BUCKET_NAME"] if "gcs" in st.secrets else "livekit-logs-rc")
+
+@st.cache_resource
+def get_transcription_service():
+    """Get a TranscriptionService shared across reruns and sessions"""
+    # Imported here so the Gemini SDK only loads once transcription is actually needed
+    from src.services.transcription_service import TranscriptionService
+    return TranscriptionService()
+
+def compute_speaker_statistics(transcription: TranscriptionResponse) -> pd.DataFrame:
+    """Compute per-speaker talk time, segment and word counts in a single groupby"""
+    segments = [seg for seg in transcription.transcription if seg.speaker_label != "silence"]
+    df = pd.DataFrame({
+        "speaker": [seg.speaker_label for seg in segments],
+        "duration": [seg.timestamp_end - seg.timestamp_start for seg in segments],
+        "words": [len(seg.text.split()) for seg in segments]
+    })
+    # sort=False keeps speakers in order of first appearance
+    return df.groupby("speaker", sort=False).agg(
+        total_time=("duration", "sum"),
+        num_segments=("duration", "size"),
+        words=("words", "sum")
+    ).reset_index()
+
+def compute_transcription_text(transcription: TranscriptionResponse, use_lithuanian: bool = False) -> str:
+    """Readable "[start - end] SPEAKER: text" lines of a transcription, silence left out"""
+    segments = transcription.lithuanian_transcription if use_lithuanian else transcription.transcription
+    return "\n".join(
+        f"[{seg.timestamp_start:.1f}s - {seg.timestamp_end:.1f}s] {seg.speaker_label.upper()}: {seg.text}"
+        for seg in segments
+        if seg.speaker_label != "silence"
+    )
+
+def transcription_version(transcription: TranscriptionResponse) -> int:
+    """Content key of a transcription for the per-session view caches
+    
+    Those caches are shared by all users, so keying on the content keeps a stale copy
+    in one user's session state from standing in for a regenerated transcription.
+    """
+    return hash(tuple(
+        (seg.timestamp_start, seg.timestamp_end, seg.speaker_label, seg.text)
+        for segments in (transcription.transcription, transcription.lithuanian_transcription)
+        for seg in segments
+    ))
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_speaker_statistics(session_id, version, _transcription: TranscriptionResponse) -> pd.DataFrame:
+    """Speaker statistics of a session transcription - cached per transcription version"""
+    return compute_speaker_statistics(_transcription)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_transcription_text(session_id, version, _transcription: TranscriptionResponse, use_lithuanian: bool = False) -> str:
+    """Readable transcription text of a session - cached per transcription version and language"""
+    return compute_transcription_text(_transcription, use_lithuanian=use_lithuanian)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_timeline_figure(session_id, version, _transcription: TranscriptionResponse):
+    """Plotly speaker timeline of a session transcription - cached per transcription version
+    
+    Raises ImportError when Plotly is not installed so callers can fall back to HTML.
+    """
+    from src.utils.timeline_viz import create_speaker_timeline_plotly
+    return create_speaker_timeline_plotly(_transcription)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_timeline_html(session_id, version, _transcription: TranscriptionResponse) -> str:
+    """HTML speaker timeline of a session transcription - cached per transcription version"""
+    return create_speaker_timeline_html(_transcription)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_transcript_html(session_id, version, _transcription: TranscriptionResponse, use_lithuanian: bool = False) -> str:
+    """Segment-by-segment transcript HTML of a session - cached per transcription version and language"""
+    if use_lithuanian:
+        return create_transcript_html(_transcription.lithuanian_transcription, silence_label="Tyla")
+    return create_transcript_html(_transcription.transcription)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_speaker_groups_html(session_id, version, _transcription: TranscriptionResponse) -> str:
+    """Transcript HTML grouped into collapsible speaker turns - cached per transcription version"""
+    return create_speaker_groups_html(_transcription.transcription)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_session_transcription_json(session_id, version, _transcription: TranscriptionResponse) -> bytes:
+    """Downloadable transcription JSON of a session - cached per transcription version"""
+    has_lithuanian = bool(getattr(_transcription, 'lithuanian_transcription', None))
+    download_data = {
+        "session_id": session_id,
+        "total_duration": _transcription.total_duration,
+        "num_speakers": _transcription.num_speakers,
+        "original_language": _transcription.original_language if has_lithuanian else "unknown",
+        "transcription": [seg.model_dump() for seg in _transcription.transcription]
+    }
+    
+    # Add Lithuanian if available
+    if has_lithuanian:
+        download_data["lithuanian_transcription"] = [seg.model_dump() for seg in _transcription.lithuanian_transcription]
+    return orjson.dumps(download_data, option=orjson.OPT_INDENT_2)
+
+@st.cache_data(ttl=60, max_entries=128, show_spinner=False)
+def load_session_index(_bucket, session_id):
+    """List the files of a session once and index them by name
+    
+    Shared by metadata, audio and file table lookups so they don't each probe GCS.
+    
+    Args:
+        _bucket: GCS bucket object
+        session_id: Session ID to list
+    
+    Returns:
+        Dict mapping file name (relative to the session folder) to its size, updated and content_type
+    """
+    prefix = f"sessions/{session_id}/"
+    blobs = _bucket.list_blobs(prefix=prefix, fields="items(name,size,updated,contentType),nextPageToken")
+    return {
+        blob.name[len(prefix):]: {
+            "size": blob.size,
+            "updated": blob.updated,
+            "content_type": blob.content_type
+        }
+        for blob in blobs
+    }
+
+def get_file_extension(filename):
+    """Lower-case extension of a file name without the dot, or '' if it has none"""
+    _, dot, extension = filename.rpartition('.')
+    return extension.lower() if dot else ''
+
+def find_audio_blob(_bucket, session_id):
+    """Locate the audio file of a session using the cached session index
+    
+    Args:
+        _bucket: GCS bucket object
+        session_id: Session ID to search
+    
+    Returns:
+        Tuple of (blob, filename), or (None, None) if no audio file exists
+    """
+    prefix = f"sessions/{session_id}/"
+    index = load_session_index(_bucket, session_id)
+    
+    # First try common audio file names in priority order
+    for filename in COMMON_AUDIO_FILES:
+        if filename in index:
+            return _bucket.blob(f"{prefix}{filename}"), filename
+    
+    # If no common names found, take ANY audio file - best extension first
+    candidates = [name for name in index if get_file_extension(name) in AUDIO_EXTENSION_RANK]
+    if candidates:
+        name = min(candidates, key=lambda name: AUDIO_EXTENSION_RANK[get_file_extension(name)])
+        return _bucket.blob(f"{prefix}{name}"), name.split('/')[-1]
+    
+    return None, None
+
+def download_audio_blob(audio_blob, destination_path):
+    """Download an audio blob to a local path using concurrent range requests
+    
+    Args:
+        audio_blob: GCS blob of the audio file
+        destination_path: Local file path to write to
+    """
+    # Fetch the object size once so chunk planning is accurate
+    if audio_blob.size is None:
+        audio_blob.reload()
+    
+    if audio_blob.size and audio_blob.size > AUDIO_DOWNLOAD_CHUNK_SIZE:
+        transfer_manager.download_chunks_concurrently(
+            audio_blob,
+            destination_path,
+            chunk_size=AUDIO_DOWNLOAD_CHUNK_SIZE,
+            max_workers=AUDIO_DOWNLOAD_MAX_WORKERS,
+            worker_type=transfer_manager.THREAD
+        )
+    else:
+        # Small files gain nothing from slicing
+        audio_blob.download_to_filename(destination_path)
+
+def download_audio_for_upload(audio_blob, audio_filename):
+    """Download an audio blob for upload to the Gemini Files API
+    
+    Recordings that fit in one download chunk stay in memory and never touch disk.
+    Larger ones go through a temp file so their slices download concurrently.
+    
+    Args:
+        audio_blob: GCS blob of the audio file
+        audio_filename: Name of the audio file, used for its extension
+    
+    Returns:
+        Tuple of (audio, mime type, temp file path) - audio is a BytesIO or a file path,
+        the temp file path is None when the audio is held in memory
+    """
+    audio_blob.reload()
+    extension = get_file_extension(audio_filename)
+    mime_type = (
+        AUDIO_MIME_TYPES.get(extension)
+        or mimetypes.guess_type(audio_filename)[0]
+        or audio_blob.content_type
+    )
+    
+    if audio_blob.size and audio_blob.size > AUDIO_DOWNLOAD_CHUNK_SIZE:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{extension}") as tmp_file:
+            temp_audio_path = tmp_file.name
+        try:
+            download_audio_blob(audio_blob, temp_audio_path)
+        except BaseException:
+            # The caller never gets the path, so don't leave a partial download behind
+            os.remove(temp_audio_path)
+            raise
+        return temp_audio_path, mime_type, temp_audio_path
+    
+    return BytesIO(audio_blob.download_as_bytes()), mime_type, None
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def get_signed_audio_url(_blob, blob_name):
+    """Sign a URL for an audio blob
+    
+    Signed for 2 hours but cached for 1, so even a URL handed out just before its
+    cache entry expires stays valid long enough to seek through a long call.
+    
+    Args:
+        _blob: GCS blob of the audio file
+        blob_name: Full blob name, used as the cache key
+    """
+    return _blob.generate_signed_url(
+        version="v4",
+        expiration=timedelta(hours=2),
+        method="GET"
+    )
 
 def get_audio_url(_bucket, session_id):
     """Generate signed URL for audio playback"""
     try:
-        # First try common audio file names - prioritize WAV files
-        common_audio_files = [
-            "recording.wav", "audio.wav",  # WAV files first
-            "recording.ogg", "audio.ogg",  # OGG files
-            "recording.mp3", "audio.mp3"   # MP3 files
-        ]
-        for filename in common_audio_files:
-            blob = _bucket.blob(f"sessions/{session_id}/{filename}")
-            if blob.exists():
-                # Store the audio format for proper playback
-                st.session_state[f"audio_format_{session_id}"] = filename
-                # Generate signed URL valid for 1 hour
-                url = blob.generate_signed_url(
-                    version="v4",
-                    expiration=timedelta(hours=1),
-                    method="GET"
-                )
-                return url
-        
-        # If no common names found, search for ANY audio file
-        blobs = _bucket.list_blobs(prefix=f"sessions/{session_id}/")
-        for blob in blobs:
-            filename = blob.name.split('/')[-1].lower()
-            # Check if it's an audio file by extension
-            if filename.endswith(('.wav', '.ogg', '.mp3', '.m4a', '.flac', '.aac', '.wma', '.opus')):
-                # Store the original filename for format detection
-                original_filename = blob.name.split('/')[-1]
-                st.session_state[f"audio_format_{session_id}"] = original_filename
-                # Generate signed URL valid for 1 hour
-                url = blob.generate_signed_url(
-                    version="v4",
-                    expiration=timedelta(hours=1),
-                    method="GET"
-                )
-                return url
-                
+        # Looked up outside the signed URL cache, so a recording added later shows up
+        # as soon as the session index refreshes
+        blob, filename = find_audio_blob(_bucket, session_id)
+        if blob:
+            # Store the audio filename for proper playback format detection
+            st.session_state[f"audio_format_{session_id}"] = filename
+            return get_signed_audio_url(blob, blob.name)
     except Exception as e:
         st.error(f"Failed to get audio URL: {e}")
     return None
 
+def detect_audio_format(session_id):
+    """Detect the playback format of the audio file found by get_audio_url
+    
+    Args:
+        session_id: The session ID
+    
+    Returns:
+        Tuple of (mime type, file extension), WAV when the format is unknown
+    """
+    extension = get_file_extension(st.session_state.get(f"audio_format_{session_id}", ""))
+    if extension not in AUDIO_MIME_TYPES:
+        extension = 'wav'
+    return AUDIO_MIME_TYPES[extension], extension
+
 def transcribe_audio_with_diarization(_bucket, session_id, force_regenerate=False):
     """Transcribe audio with speaker diarization
     
@@ -70,65 +353,41 @@ def transcribe_audio_with_diarization(_bucket, session_id, force_regenerate=Fals
         return
     
     # Check if transcription already exists in session state (unless forced to regenerate)
-    if not force_regenerate and f"transcription_{session_id}" in st.session_state:
+    transcription_key = f"transcription_{session_id}"
+    if not force_regenerate and transcription_key in st.session_state:
         st.info("Using cached transcription. Click 'Generate Transcription' to regenerate.")
-        return st.session_state[f"transcription_{session_id}"]
+        return st.session_state[transcription_key]
     
     # If force_regenerate, clear the existing cache
-    if force_regenerate and f"transcription_{session_id}" in st.session_state:
-        del st.session_state[f"transcription_{session_id}"]
+    if force_regenerate and transcription_key in st.session_state:
+        del st.session_state[transcription_key]
         st.info("🔄 Regenerating transcription...")
     
-    with st.spinner("🔄 Downloading audio file..."):
-        # Download audio to temp file - prioritize WAV files
-        audio_blob = None
-        audio_filename = None
-        
-        # First try common audio file names
-        common_audio_files = [
-            "recording.wav", "audio.wav",  # WAV files first
-            "recording.ogg", "audio.ogg",  # OGG files
-            "recording.mp3", "audio.mp3"   # MP3 files
-        ]
-        for filename in common_audio_files:
-            blob = _bucket.blob(f"sessions/{session_id}/{filename}")
-            if blob.exists():
-                audio_blob = blob
-                audio_filename = filename
-                break
-        
-        # If not found, search for ANY audio file
-        if not audio_blob:
-            blobs = _bucket.list_blobs(prefix=f"sessions/{session_id}/")
-            for blob in blobs:
-                filename = blob.name.split('/')[-1].lower()
-                # Check if it's an audio file by extension
-                if filename.endswith(('.wav', '.ogg', '.mp3', '.m4a', '.flac', '.aac', '.wma', '.opus')):
-                    audio_blob = blob
-                    audio_filename = blob.name.split('/')[-1]
-                    break
-        
-        if not audio_blob:
-            st.error("No audio file found")
-            return None
-        
-        # Create temp file with the correct extension
-        file_extension = "." + audio_filename.split('.')[-1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            audio_blob.download_to_file(tmp_file)
-            temp_audio_path = tmp_file.name
-    
+    # Owned by the finally below, so a failure at any step still removes the temp file
+    temp_audio_path = None
     try:
+        with st.spinner("🔄 Downloading audio file..."):
+            # Download audio - prioritize WAV files
+            audio_blob, audio_filename = find_audio_blob(_bucket, session_id)
+            
+            if not audio_blob:
+                st.error("No audio file found")
+                return None
+            
+            audio, mime_type, temp_audio_path = download_audio_for_upload(audio_blob, audio_filename)
+        
         with st.spinner("🎙️ Transcribing with speaker diarization... This may take a few minutes..."):
-            # Initialize transcription service
-            transcription_service = TranscriptionService()
+            # Get shared transcription service
+            transcription_service = get_transcription_service()
             
             # Perform transcription
-            transcription = transcription_service.transcribe_audio(temp_audio_path, session_id)
+            transcription = transcription_service.transcribe_audio(audio, session_id, mime_type=mime_type)
             
             if transcription:
-                # Store in session state
-                st.session_state[f"transcription_{session_id}"] = transcription
+                # Store in session state - cached views are keyed on its content, so they need no clearing
+                remember_session_result(transcription_key, transcription)
+                # The transcription file is new or replaced
+                load_session_index.clear()
                 st.success("✅ Transcription complete!")
                 return transcription
             else:
@@ -142,7 +401,7 @@ def transcribe_audio_with_diarization(_bucket, session_id, force_regenerate=Fals
         return None
     finally:
         # Clean up temp file
-        if os.path.exists(temp_audio_path):
+        if temp_audio_path and os.path.exists(temp_audio_path):
             os.remove(temp_audio_path)
 
 def analyze_transcription_with_gemini(session_id, force_regenerate=False):
@@ -165,8 +424,18 @@ def analyze_transcription_with_gemini(session_id, force_regenerate=False):
         st.error("❌ Gemini API key not configured. Add GEMINI_API_KEY to .streamlit/secrets.toml")
         return None
     
-    # Check if transcription exists
+    # Check if transcription exists - load it from GCS if it isn't in session state
     transcription_key = f"transcription_{session_id}"
+    if transcription_key not in st.session_state:
+        bucket = get_sessions_bucket()
+        if "transcription.json" in load_session_index(bucket, session_id):
+            transcription_blob = bucket.blob(f"sessions/{session_id}/transcription.json")
+            try:
+                trans_data = orjson.loads(transcription_blob.download_as_bytes())
+                remember_session_result(transcription_key, TranscriptionResponse(**trans_data))
+            except Exception as e:
+                st.error(f"❌ Could not load transcription: {e}")
+                return None
     if transcription_key not in st.session_state:
         st.error("❌ No transcription found. Please generate transcription first.")
         return None
@@ -187,6 +456,16 @@ def analyze_transcription_with_gemini(session_id, force_regenerate=False):
             # Get transcription
             transcription = st.session_state[transcription_key]
             
+            # Note the saved analysis version before analyzing, so one saved by someone
+            # else while Gemini runs is not silently overwritten below
+            bucket = get_sessions_bucket()
+            blob = bucket.blob(f"sessions/{session_id}/conversation_analysis.json")
+            try:
+                blob.reload()
+                generation = blob.generation
+            except NotFound:
+                generation = 0  # Must still not exist when uploading
+            
             # Initialize analysis service
             analysis_service = ConversationAnalysisService()
             
@@ -195,32 +474,23 @@ def analyze_transcription_with_gemini(session_id, force_regenerate=False):
             
             if analysis:
                 # Store in session state
-                st.session_state[analysis_key] = analysis
+                remember_session_result(analysis_key, analysis)
                 
                 # Save to GCS for persistence
                 try:
-                    import json
-                    from google.cloud import storage
-                    from google.oauth2 import service_account
-                    
-                    # Create credentials from service account info in secrets
-                    if "gcp_service_account" in st.secrets:
-                        credentials = service_account.Credentials.from_service_account_info(
-                            st.secrets["gcp_service_account"]
-                        )
-                        client = storage.Client(
-                            credentials=credentials,
-                            project=st.secrets["gcs"]["GOOGLE_CLOUD_PROJECT"] if "gcs" in st.secrets else "voting-2024"
-                        )
-                    else:
-                        # Fallback - try without explicit credentials (won't work on Streamlit Cloud)
-                        client = storage.Client()
-                    
-                    bucket = client.bucket(st.secrets["gcs"]["GCS_BUCKET_NAME"] if "gcs" in st.secrets else "livekit-logs-rc")
-                    blob = bucket.blob(f"sessions/{session_id}/conversation_analysis.json")
-                    analysis_json = json.dumps(analysis.model_dump(), indent=2, default=str)
-                    blob.upload_from_string(analysis_json, content_type='application/json')
+                    analysis_json = orjson.dumps(analysis.model_dump(), default=str)
+                    # Store gzip-encoded; GCS clients transparently decompress on download
+                    blob.content_encoding = "gzip"
+                    blob.upload_from_string(
+                        gzip.compress(analysis_json),
+                        content_type='application/json',
+                        if_generation_match=generation
+                    )
+                    load_session_index.clear()
                     st.success("✅ Analysis complete and saved!")
+                except PreconditionFailed:
+                    st.warning("Analysis complete but not saved - this session's analysis was saved by someone else in the meantime")
+                    st.success("✅ Analysis complete!")
                 except Exception as e:
                     st.warning(f"Analysis complete but couldn't save to GCS: {e}")
                     st.success("✅ Analysis complete!")
@@ -241,151 +511,193 @@ def analyze_audio_with_gemini(_bucket, session_id):
     """DEPRECATED: Use analyze_transcription_with_gemini instead"""
     st.warning("⚠️ This function is deprecated. Using new analysis method.")
     return analyze_transcription_with_gemini(session_id, force_regenerate=True)
+
+# HTML templates for the speaker timeline, parsed once at import
+TIMELINE_HEADER_TEMPLATE = (
+    '<div style="position: relative; width: 100%; background: #f0f0f0; border: 1px solid #ddd; border-radius: 4px; overflow-x: auto;">'
+    '<div style="position: relative; height: 60px; width: {width}px; margin: 10px;">'
+)
+TIMELINE_SEGMENT_TEMPLATE = (
+    '<div style="position: absolute; left: {left:.1f}px; width: {width:.1f}px; height: 40px; '
+    'background: {color}; border: 1px solid white; cursor: pointer; '
+    'display: flex; align-items: center; justify-content: center; '
+    'font-size: 10px; color: white; overflow: hidden;" '
+    'title="{tooltip}">'
+    '{label}'
+    '</div>'
+)
+TIMELINE_MARKER_TEMPLATE = (
+    '<div style="position: absolute; left: {left:.1f}px; bottom: -20px; '
+    'font-size: 10px; color: #666;">'
+    '{seconds}s'
+    '</div>'
+)
+TIMELINE_LEGEND_START = '</div><div style="padding: 5px 10px; font-size: 12px; display: flex; flex-wrap: wrap; gap: 15px;">'
+TIMELINE_LEGEND_TEMPLATE = (
+    '<span style="display: flex; align-items: center;">'
+    '<span style="display: inline-block; width: 12px; height: 12px; '
+    'background: {color}; margin-right: 5px; border-radius: 2px;"></span>'
+    '{label}'
+    '</span>'
+)
+TIMELINE_FOOTER = '</div></div>'
+TIMELINE_COLORS = {**SPEAKER_COLORS, "silence": "#E0E0E0"}  # Gray for silence
+TIMELINE_MIN_SPAN_PX = 4  # Same-speaker segments merge while narrower than this together
+TIMELINE_MIN_SILENCE = 0.1  # Silences shorter than this (seconds) are not drawn
+
+def coalesce_timeline_segments(segments, scale):
+    """Merge runs of tiny same-speaker segments and drop micro-silences before drawing
     
-    with st.spinner("🔄 Downloading audio file..."):
-        # Download audio to temp file - prioritize WAV files
-        audio_blob = None
-        audio_filename = None
-        
-        # First try common audio file names
-        common_audio_files = [
-            "recording.wav", "audio.wav",  # WAV files first
-            "recording.ogg", "audio.ogg",  # OGG files
-            "recording.mp3", "audio.mp3"   # MP3 files
-        ]
-        for filename in common_audio_files:
-            blob = _bucket.blob(f"sessions/{session_id}/{filename}")
-            if blob.exists():
-                audio_blob = blob
-                audio_filename = filename
-                break
-        
-        # If not found, search for ANY audio file
-        if not audio_blob:
-            blobs = _bucket.list_blobs(prefix=f"sessions/{session_id}/")
-            for blob in blobs:
-                filename = blob.name.split('/')[-1].lower()
-                # Check if it's an audio file by extension
-                if filename.endswith(('.wav', '.ogg', '.mp3', '.m4a', '.flac', '.aac', '.wma', '.opus')):
-                    audio_blob = blob
-                    audio_filename = blob.name.split('/')[-1]
-                    break
-        
-        if not audio_blob:
-            st.error("No audio file found")
-            return
-        
-        # Create temp file with the correct extension
-        file_extension = "." + audio_filename.split('.')[-1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            audio_blob.download_to_file(tmp_file)
-            temp_audio_path = tmp_file.name
+    Args:
+        segments: Transcription segments in time order
+        scale: Timeline pixels per second
     
-    try:
-        with st.spinner("🤖 Analyzing with Gemini 2.5 Pro... This may take a few minutes..."):
-            # Get analyzer
-            analyzer = get_gemini_analyzer()
-            
-            # Perform analysis
-            analysis = analyzer.analyze_audio(temp_audio_path, session_id)
-            
-            # Store in session state
-            st.session_state[f"analysis_{session_id}"] = analysis
-            
-            st.success("✅ Analysis complete!")
-            
-            return analysis
-            
-    except Exception as e:
-        st.error(f"❌ Analysis failed: {str(e)}")
-        import traceback
-        st.error(traceback.format_exc())
-    finally:
-        # Clean up temp file
-        if os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
+    Returns:
+        List of [speaker, start, end, text] spans, text being that of the first merged segment
+    """
+    spans = []
+    for seg in segments:
+        speaker = seg.speaker_label
+        if speaker == "silence" and seg.timestamp_end - seg.timestamp_start < TIMELINE_MIN_SILENCE:
+            continue
+        
+        last = spans[-1] if spans else None
+        if last and last[0] == speaker and (seg.timestamp_end - last[1]) * scale < TIMELINE_MIN_SPAN_PX:
+            # Too narrow to tell apart - extend the previous span instead of adding a div
+            last[2] = seg.timestamp_end
+        else:
+            spans.append([speaker, seg.timestamp_start, seg.timestamp_end, seg.text])
+    return spans
 
 def create_speaker_timeline_html(transcription: TranscriptionResponse) -> str:
     """Create HTML visualization of speaker timeline"""
     
-    # Define colors for different speakers
-    speaker_colors = {
-        "speaker1": "#4CAF50",  # Green
-        "speaker2": "#2196F3",  # Blue
-        "speaker3": "#FF9800",  # Orange
-        "speaker4": "#9C27B0",  # Purple
-        "speaker5": "#F44336",  # Red
-        "silence": "#E0E0E0"    # Gray
-    }
-    
     # Calculate timeline width
     total_duration = transcription.total_duration
     width_scale = 800  # Total width in pixels
     
     # Start with a container div
-    html_parts = []
-    html_parts.append('<div style="position: relative; width: 100%; background: #f0f0f0; border: 1px solid #ddd; border-radius: 4px; overflow-x: auto;">')
-    html_parts.append(f'<div style="position: relative; height: 60px; width: {width_scale}px; margin: 10px;">')
+    html_parts = [TIMELINE_HEADER_TEMPLATE.format(width=width_scale)]
+    
+    # Compute segment geometry in one vectorized pass
+    scale = width_scale / total_duration  # Pixels per second
+    spans = coalesce_timeline_segments(transcription.transcription, scale)
+    starts = np.array([span[1] for span in spans], dtype=float)
+    ends = np.array([span[2] for span in spans], dtype=float)
+    start_positions = starts * scale
+    # Enforce a minimum width on very small segments for visual clarity
+    widths = np.maximum((ends - starts) * scale, 2)
     
     # Add speaker segments
-    for segment in transcription.transcription:
-        start_pos = (segment.timestamp_start / total_duration) * width_scale
-        width = ((segment.timestamp_end - segment.timestamp_start) / total_duration) * width_scale
-        color = speaker_colors.get(segment.speaker_label, "#888888")
-        
-        # Skip very small segments for visual clarity
-        if width < 2:
-            width = 2
-        
-        label = segment.speaker_label.upper() if segment.speaker_label != "silence" else ""
-        tooltip = f"{segment.speaker_label}: {segment.timestamp_start:.1f}s - {segment.timestamp_end:.1f}s"
-        if segment.speaker_label != "silence" and hasattr(segment, 'text'):
-            # Escape HTML in tooltip text
-            text_preview = segment.text[:50].replace('"', '&quot;').replace("'", '&#39;')
-            tooltip += f" - {text_preview}..."
+    color_for = TIMELINE_COLORS.get
+    for (speaker, start, end, text), start_pos, width in zip(spans, start_positions.tolist(), widths.tolist()):
+        tooltip = f"{speaker}: {start:.1f}s - {end:.1f}s"
+        if speaker == "silence":
+            label = ""
+        else:
+            label = speaker.upper() if width > 30 else ""
+            tooltip += f" - {text[:50]}..."
         
-        segment_html = (
-            f'<div style="position: absolute; left: {start_pos:.1f}px; width: {width:.1f}px; height: 40px; '
-            f'background: {color}; border: 1px solid white; cursor: pointer; '
-            f'display: flex; align-items: center; justify-content: center; '
-            f'font-size: 10px; color: white; overflow: hidden;" '
-            f'title="{tooltip}">'
-            f'{label if width > 30 else ""}'
-            f'</div>'
-        )
-        html_parts.append(segment_html)
+        html_parts.append(TIMELINE_SEGMENT_TEMPLATE.format(
+            left=start_pos,
+            width=width,
+            color=color_for(speaker, "#888888"),
+            # Escape the whole attribute value in one pass - labels come from the model too
+            tooltip=escape(tooltip),
+            label=escape(label)
+        ))
     
     # Add time markers
     for i in range(0, int(total_duration) + 1, max(1, int(total_duration) // 10)):
-        pos = (i / total_duration) * width_scale
-        time_marker = (
-            f'<div style="position: absolute; left: {pos:.1f}px; bottom: -20px; '
-            f'font-size: 10px; color: #666;">'
-            f'{i}s'
-            f'</div>'
-        )
-        html_parts.append(time_marker)
+        html_parts.append(TIMELINE_MARKER_TEMPLATE.format(
+            left=i * scale,
+            seconds=i
+        ))
     
-    html_parts.append('</div>')
-    html_parts.append('<div style="padding: 5px 10px; font-size: 12px; display: flex; flex-wrap: wrap; gap: 15px;">')
+    html_parts.append(TIMELINE_LEGEND_START)
     
     # Add legend for each speaker that appears in the transcription
     speakers_in_transcript = set(seg.speaker_label for seg in transcription.transcription)
     
     for speaker in sorted(speakers_in_transcript):
-        if speaker in speaker_colors:
-            color = speaker_colors[speaker]
-            label = speaker.upper() if speaker != "silence" else "Silence"
-            legend_item = (
-                f'<span style="display: flex; align-items: center;">'
-                f'<span style="display: inline-block; width: 12px; height: 12px; '
-                f'background: {color}; margin-right: 5px; border-radius: 2px;"></span>'
-                f'{label}'
-                f'</span>'
-            )
-            html_parts.append(legend_item)
+        if speaker in TIMELINE_COLORS:
+            html_parts.append(TIMELINE_LEGEND_TEMPLATE.format(
+                color=TIMELINE_COLORS[speaker],
+                label=speaker.upper() if speaker != "silence" else "Silence"
+            ))
+    
+    html_parts.append(TIMELINE_FOOTER)
+    
+    return ''.join(html_parts)
+
+# HTML templates for the transcript views, rendered with a single st.markdown call
+TRANSCRIPT_SEGMENT_TEMPLATE = (
+    '<div style="padding: 6px 0; border-bottom: 1px solid #eee;">'
+    '<span style="color: #888; font-size: 0.85em; margin-right: 8px;">[{start:.1f}s - {end:.1f}s]</span>'
+    '<span style="color: {color}; font-weight: bold;">{label}</span>'
+    '<div>{text}</div>'
+    '</div>'
+)
+TRANSCRIPT_SILENCE_TEMPLATE = (
+    '<div style="padding: 6px 0; color: #888; font-style: italic;">— {label} ({duration:.1f}s) —</div>'
+)
+SPEAKER_GROUP_TEMPLATE = (
+    '<details style="border: 1px solid #ddd; border-radius: 4px; padding: 6px 10px; margin-bottom: 6px;">'
+    '<summary style="cursor: pointer;">{label} - {count} segment(s)</summary>'
+    '{body}'
+    '</details>'
+)
+SPEAKER_GROUP_LINE_TEMPLATE = '<p style="margin: 6px 0;"><b>[{start:.1f}s - {end:.1f}s]</b> {text}</p>'
+
+def _transcript_text_html(text: str) -> str:
+    """Escape segment text, keeping line breaks inside the surrounding HTML block"""
+    return escape(text).replace("\n", "<br>")
+
+def create_transcript_html(segments, silence_label: str = "Silence") -> str:
+    """Create HTML for a segment-by-segment transcript
+    
+    Args:
+        segments: Transcription segments to render
+        silence_label: Label shown for significant silences
     
-    html_parts.append('</div>')
-    html_parts.append('</div>')
+    Returns:
+        HTML string with one block per segment
+    """
+    html_parts = []
+    for seg in segments:
+        if seg.speaker_label != "silence":
+            html_parts.append(TRANSCRIPT_SEGMENT_TEMPLATE.format(
+                start=seg.timestamp_start,
+                end=seg.timestamp_end,
+                color=SPEAKER_COLORS.get(seg.speaker_label, "#666666"),
+                label=escape(seg.speaker_label.upper()),
+                text=_transcript_text_html(seg.text)
+            ))
+        else:
+            duration = seg.timestamp_end - seg.timestamp_start
+            if duration > 2:  # Only show significant silences
+                html_parts.append(TRANSCRIPT_SILENCE_TEMPLATE.format(label=silence_label, duration=duration))
+    return ''.join(html_parts)
+
+def create_speaker_groups_html(segments) -> str:
+    """Create HTML grouping consecutive segments of the same speaker into collapsible blocks
     
-    return ''.join(html_parts)
\ No newline at end of file
+    Silences are skipped and do not split a speaker's turn.
+    """
+    spoken = (seg for seg in segments if seg.speaker_label != "silence")
+    html_parts = []
+    for speaker, group in groupby(spoken, key=lambda seg: seg.speaker_label):
+        lines = [
+            SPEAKER_GROUP_LINE_TEMPLATE.format(
+                start=seg.timestamp_start,
+                end=seg.timestamp_end,
+                text=_transcript_text_html(seg.text)
+            )
+            for seg in group
+        ]
+        html_parts.append(SPEAKER_GROUP_TEMPLATE.format(
+            label=escape(speaker.upper()),
+            count=len(lines),
+            body=''.join(lines)
+        ))
+    return ''.join(html_parts)
@@ -37,7 +37,7 @@ if analysis_blob.exists():
     print("\n=== Checking Session Metadata ===")
     
     # List all files in session
-    blobs = bucket.list_blobs(prefix=f"sessions/{session_id}/")
+    blobs = bucket.list_blobs(prefix=f"sessions/{session_id}/", fields="items(name),nextPageToken")
     files = []
     for blob in blobs:
         files.append(blob.name.split('/')[-1])
@@ -5,23 +5,25 @@ Handles audio transcription and all analysis requirements using Pydantic structu
 
 import os
 import time
-import json
-from typing import Optional
+import asyncio
+import functools
+import hashlib
+import logging
+import threading
+import orjson
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from datetime import datetime
-import google.generativeai as genai
 from pydantic import ValidationError
-import streamlit as st
 
 from json_parser import parse_gemini_response
 from models import (
     ComprehensiveCallAnalysis,
     Language,
     EmotionalTone,
-    ConversationStage,
     SatisfactionLevel,
     ProblemStatus,
     ConversationCategory,
-    TranscriptionSegment,
     Transcription,
     Translation,
     EmotionalAnalysis,
@@ -34,100 +36,13 @@ from models import (
     ConversationCategorization
 )
 
+if TYPE_CHECKING:
+    import google.genai as genai
 
+logger = logging.getLogger(__name__)
 
-class GeminiCallAnalyzer:
-    """
-    Comprehensive call analyzer using Gemini 2.5 Pro with Pydantic structured outputs
-    Implements all requirements R_13 through R_19 plus categorization
-    """
-    
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize Gemini client with API key from Streamlit secrets"""
-        # Try to get API key from Streamlit secrets first, then fall back to parameter
-        try:
-            if api_key:
-                self.api_key = api_key
-            elif "gcs" in st.secrets and "GEMINI_API_KEY" in st.secrets["gcs"]:
-                self.api_key = st.secrets["gcs"]["GEMINI_API_KEY"]
-            else:
-                self.api_key = None
-        except:
-            # If st.secrets not available (e.g., when running outside Streamlit)
-            self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY is required. Please add it to .streamlit/secrets.toml or provide it as an argument.")
-        
-        genai.configure(api_key=self.api_key)
-        
-        # Use the latest Gemini model that supports structured outputs
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    def analyze_audio(self, audio_path: str, session_id: str) -> ComprehensiveCallAnalysis:
-        """
-        Perform complete analysis of audio file using Pydantic structured output
-        
-        Args:
-            audio_path: Path to audio file
-            session_id: Session identifier
-            
-        Returns:
-            ComprehensiveCallAnalysis with all structured outputs
-        """
-        start_time = time.time()
-        
-        # Upload audio file
-        audio_file = genai.upload_file(audio_path)
-        
-        # Create comprehensive prompt focusing on requirements, not structure
-        prompt = self._create_analysis_prompt()
-        
-        # Configure generation with JSON mode (schema too complex for Gemini)
-        generation_config = genai.GenerationConfig(
-            temperature=0.3,
-            top_p=0.95,
-            top_k=40,
-            max_output_tokens=8192,
-            response_mime_type="application/json"
-            # NOTE: ComprehensiveCallAnalysis schema is too complex for Gemini
-            # Using JSON mode without schema constraint
-        )
-        
-        try:
-            # Generate analysis with structured output
-            response = self.model.generate_content(
-                [audio_file, prompt],
-                generation_config=generation_config
-            )
-            
-            # Parse JSON response
-            analysis_data = json.loads(response.text)
-            
-            # Use the parser to create ComprehensiveCallAnalysis
-            analysis = parse_gemini_response(
-                analysis_data, 
-                session_id,
-                int((time.time() - start_time) * 1000)
-            )
-            
-            return analysis
-            
-        except ValidationError as e:
-            print(f"Validation error: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._create_partial_analysis({}, session_id, start_time)
-        except Exception as e:
-            print(f"Error during analysis: {e}")
-            print(f"Error type: {type(e).__name__}")
-            import traceback
-            traceback.print_exc()
-            return self._create_partial_analysis({}, session_id, start_time)
-    
-    def _create_analysis_prompt(self) -> str:
-        """Create comprehensive analysis prompt for Gemini"""
-        return """
+# Analysis prompt - input independent, so built once at import
+ANALYSIS_PROMPT = """
         Analyze this customer service call recording and provide a comprehensive structured analysis.
         
         REQUIRED TASKS:
@@ -204,32 +119,205 @@ class GeminiCallAnalyzer:
         - Ensure all boolean fields are true/false
         - Include confidence scores where relevant (0.0-1.0)
         """
+
+
+# Use the latest Gemini model that supports structured outputs
+ANALYSIS_MODEL = "gemini-2.0-flash-exp"
+
+# Configure generation with JSON mode (schema too complex for Gemini)
+ANALYSIS_GENERATION_CONFIG = {
+    "temperature": 0.3,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_mime_type": "application/json"
+    # NOTE: ComprehensiveCallAnalysis schema is too complex for Gemini
+    # Using JSON mode without schema constraint
+}
+
+
+# Raw analysis responses by audio content, so re-analyzing a recording skips Gemini
+RESPONSE_CACHE_SIZE = 32
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()  # Streamlit script runs and analyze_batch share it across threads
+
+
+def _audio_digest(audio_path: str) -> str:
+    """BLAKE2b digest of an audio file, read in 64 KiB chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(audio_path, 'rb') as audio:
+        for chunk in iter(lambda: audio.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_cached_response(audio_digest: str) -> Optional[str]:
+    """Get the cached response text for an audio digest, if any"""
+    with _response_cache_lock:
+        response_text = _response_cache.get(audio_digest)
+        if response_text is not None:
+            _response_cache.move_to_end(audio_digest)
+        return response_text
+
+
+def _cache_response(audio_digest: str, response_text: str):
+    """Cache a response text, evicting the least recently used ones beyond RESPONSE_CACHE_SIZE"""
+    with _response_cache_lock:
+        _response_cache[audio_digest] = response_text
+        _response_cache.move_to_end(audio_digest)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key: str) -> "genai.Client":
+    """Gemini client shared by all analyzers - its HTTP connections stay open across uploads and requests"""
+    import google.genai as genai
+    
+    return genai.Client(api_key=api_key)
+
+
+class GeminiCallAnalyzer:
+    """
+    Comprehensive call analyzer using Gemini 2.5 Pro with Pydantic structured outputs
+    Implements all requirements R_13 through R_19 plus categorization
+    """
+    
+    def __init__(self, api_key: Optional[str] = None):
+        """Initialize Gemini client with API key from Streamlit secrets"""
+        # Try to get API key from Streamlit secrets first, then fall back to parameter
+        try:
+            if api_key:
+                self.api_key = api_key
+            else:
+                import streamlit as st  # Only needed for secrets - heavy to import for non-Streamlit callers
+                if "gcs" in st.secrets and "GEMINI_API_KEY" in st.secrets["gcs"]:
+                    self.api_key = st.secrets["gcs"]["GEMINI_API_KEY"]
+                else:
+                    self.api_key = None
+        except:
+            # If st.secrets not available (e.g., when running outside Streamlit)
+            self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        
+        if not self.api_key:
+            raise ValueError("GEMINI_API_KEY is required. Please add it to .streamlit/secrets.toml or provide it as an argument.")
+        
+        self.client = _get_client(self.api_key)
+    
+    def analyze_audio(self, audio_path: str, session_id: str) -> ComprehensiveCallAnalysis:
+        """
+        Perform complete analysis of audio file using Pydantic structured output
+        
+        Args:
+            audio_path: Path to audio file
+            session_id: Session identifier
+            
+        Returns:
+            ComprehensiveCallAnalysis with all structured outputs
+        """
+        start_time = time.monotonic()  # Durations only - immune to wall clock adjustments
+        
+        # Reuse the response of an identical recording analyzed before
+        audio_digest = _audio_digest(audio_path)
+        response_text = _get_cached_response(audio_digest)
+        
+        if response_text is None:
+            # Upload audio file
+            audio_file = self.client.files.upload(file=audio_path)
+            
+            # Create comprehensive prompt focusing on requirements, not structure
+            prompt = self._create_analysis_prompt()
+        
+        try:
+            if response_text is None:
+                # Generate analysis with structured output
+                response = self.client.models.generate_content(
+                    model=ANALYSIS_MODEL,
+                    contents=[audio_file, prompt],
+                    config=ANALYSIS_GENERATION_CONFIG
+                )
+                response_text = response.text
+            
+            # Parse JSON response
+            analysis_data = orjson.loads(response_text)
+            
+            # Use the parser to create ComprehensiveCallAnalysis
+            analysis = parse_gemini_response(
+                analysis_data, 
+                session_id,
+                int((time.monotonic() - start_time) * 1000)
+            )
+            
+            # Only responses that parsed are cached, so a bad one is retried next time
+            _cache_response(audio_digest, response_text)
+            return analysis
+            
+        except ValidationError:
+            logger.exception("Validation error analyzing session %s", session_id)
+            return self._create_partial_analysis({}, session_id, start_time)
+        except Exception:
+            logger.exception("Error during analysis of session %s", session_id)
+            return self._create_partial_analysis({}, session_id, start_time)
+    
+    async def analyze_audio_async(self, audio_path: str, session_id: str) -> ComprehensiveCallAnalysis:
+        """
+        Async variant of analyze_audio, so several recordings can be analyzed concurrently
+        
+        Runs the blocking analyze_audio on a worker thread, so the cache, parsing and
+        fallback handling stay in one place instead of being repeated for client.aio.
+        """
+        return await asyncio.to_thread(self.analyze_audio, audio_path, session_id)
+    
+    async def analyze_batch(self, recordings: List[Tuple[str, str]], max_concurrency: int = 4) -> List[ComprehensiveCallAnalysis]:
+        """
+        Analyze several recordings concurrently
+        
+        Args:
+            recordings: (audio_path, session_id) pairs
+            max_concurrency: Most analyses in flight at once, to stay within Gemini rate limits
+            
+        Returns:
+            ComprehensiveCallAnalysis per recording, in the same order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze(audio_path: str, session_id: str) -> ComprehensiveCallAnalysis:
+            async with semaphore:
+                return await self.analyze_audio_async(audio_path, session_id)
+        
+        return await asyncio.gather(*(analyze(audio_path, session_id) for audio_path, session_id in recordings))
+    
+    def _create_analysis_prompt(self) -> str:
+        """Create comprehensive analysis prompt for Gemini"""
+        return ANALYSIS_PROMPT
     
     def _create_partial_analysis(self, data: dict, session_id: str, start_time: float) -> ComprehensiveCallAnalysis:
         """Create analysis with partial data when full parsing fails"""
-        # Provide defaults for all required fields
-        return ComprehensiveCallAnalysis(
+        # Provide defaults for all required fields - they are known to be valid,
+        # so the models are built with model_construct() and skip validation
+        full_text = data.get('transcription', {}).get('full_text', 'Analysis failed')
+        return ComprehensiveCallAnalysis.model_construct(
             session_id=session_id,
             analysis_timestamp=datetime.now(),
-            processing_duration_ms=int((time.time() - start_time) * 1000),
+            processing_duration_ms=int((time.monotonic() - start_time) * 1000),
             
-            transcription=Transcription(
+            transcription=Transcription.model_construct(
                 original_language=Language.UNKNOWN,
                 segments=[],
-                full_text=data.get('transcription', {}).get('full_text', 'Analysis failed'),
+                full_text=full_text,
                 total_duration_seconds=0,
                 transcription_confidence=0.5,
-                word_count=0
+                word_count=len(full_text.split())  # What the word_count validator would derive
             ),
             
-            translation=Translation(
+            translation=Translation.model_construct(
                 target_language="lt",
                 translated_segments=[],
                 full_translated_text=data.get('translation', {}).get('full_translated_text', 'Analizė nepavyko'),
                 translation_notes=None
             ),
             
-            emotional_analysis=EmotionalAnalysis(
+            emotional_analysis=EmotionalAnalysis.model_construct(
                 customer_overall_emotion=EmotionalTone.NEUTRAL,
                 customer_emotion_progression=[],
                 customer_emotion_summary="Analysis failed",
@@ -242,7 +330,7 @@ class GeminiCallAnalyzer:
                 recommendations=[]
             ),
             
-            structure_analysis=ConversationStructure(
+            structure_analysis=ConversationStructure.model_construct(
                 detected_stages=[],
                 expected_stages=[],
                 missing_stages=[],
@@ -252,7 +340,7 @@ class GeminiCallAnalyzer:
                 structure_summary="Analysis incomplete"
             ),
             
-            satisfaction_analysis=SatisfactionAnalysis(
+            satisfaction_analysis=SatisfactionAnalysis.model_construct(
                 overall_satisfaction=SatisfactionLevel.NEUTRAL,
                 satisfaction_score=50,
                 satisfaction_indicators=[],
@@ -264,7 +352,7 @@ class GeminiCallAnalyzer:
                 follow_up_reason=None
             ),
             
-            politeness_analysis=PolitenessAnalysis(
+            politeness_analysis=PolitenessAnalysis.model_construct(
                 detected_elements=[],
                 agent_greeting_present=False,
                 agent_farewell_present=False,
@@ -279,7 +367,7 @@ class GeminiCallAnalyzer:
                 recommendations=[]
             ),
             
-            resolution_analysis=ResolutionAnalysis(
+            resolution_analysis=ResolutionAnalysis.model_construct(
                 problem_statement="Unknown",
                 problem_category=ConversationCategory.OTHER,
                 resolution_status=ProblemStatus.PENDING,
@@ -294,7 +382,7 @@ class GeminiCallAnalyzer:
                 review_priority="medium"
             ),
             
-            pause_analysis=PauseAnalysis(
+            pause_analysis=PauseAnalysis.model_construct(
                 total_pauses=0,
                 long_pauses=[],
                 total_pause_duration=0,
@@ -306,7 +394,7 @@ class GeminiCallAnalyzer:
                 recommendations=[]
             ),
             
-            summary=ConversationSummary(
+            summary=ConversationSummary.model_construct(
                 summary_lt="Analizė nepilna",
                 key_points_lt=["Analizės klaida"],
                 customer_request="Unknown",
@@ -318,7 +406,7 @@ class GeminiCallAnalyzer:
                 improvement_suggestions=[]
             ),
             
-            categorization=ConversationCategorization(
+            categorization=ConversationCategorization.model_construct(
                 primary_category=ConversationCategory.OTHER,
                 secondary_categories=[],
                 tags=[],
@@ -329,7 +417,7 @@ class GeminiCallAnalyzer:
                 auto_generated_labels=[]
             ),
             
-            overall_quality_score=0,
+            overall_quality_score=50.0,  # Weighted average of the neutral 50 scores above, as the validator derives
             requires_immediate_review=True,
             critical_issues=["Analysis failed - manual review required"],
             top_recommendations=["Manually review this recording"]
@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import google.generativeai as genai
 import json
+import orjson
 
 # Load environment variables
 load_dotenv()
@@ -65,7 +66,7 @@ def test_simplest_structure():
         
         if hasattr(response, 'text'):
             print(f"Raw response: {response.text[:200]}...")
-            data = json.loads(response.text)
+            data = orjson.loads(response.text)
             print(f"Parsed JSON: {json.dumps(data, indent=2)}")
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -90,7 +91,7 @@ def test_simplest_structure():
         
         if hasattr(response, 'text'):
             print(f"Raw response: {response.text[:200]}...")
-            data = json.loads(response.text)
+            data = orjson.loads(response.text)
             print(f"Parsed JSON: {json.dumps(data, indent=2)}")
             
             # Create Pydantic instance
@@ -3,7 +3,9 @@ JSON parser for Gemini response to ComprehensiveCallAnalysis
 Handles field name mapping and data transformation
 """
 
-from typing import Dict, Any, List
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, get_args
 from models import (
     ComprehensiveCallAnalysis,
     Language, EmotionalTone, ConversationStage,
@@ -13,7 +15,8 @@ from models import (
     SatisfactionAnalysis, PolitenessAnalysis,
     ResolutionAnalysis, PauseAnalysis,
     ConversationSummary, ConversationCategorization,
-    ToneMismatch, ResolutionAttempt
+    ToneMismatch, ResolutionAttempt,
+    calculate_quality_score
 )
 
 
@@ -27,301 +30,463 @@ def safe_get(data: Dict, *keys, default=None):
     return data if data is not None else default
 
 
-def parse_gemini_response(data, session_id: str, processing_duration_ms: int) -> ComprehensiveCallAnalysis:
+def _list(value):
+    """Copy a list value - anything else (e.g. a lone string) is invalid rather than split into characters"""
+    if not isinstance(value, (list, tuple)):
+        raise TypeError(f"expected a list, got {type(value).__name__}")
+    return list(value)
+
+
+def _text(value):
+    """Keep a string value - anything else is invalid"""
+    if not isinstance(value, str):
+        raise TypeError(f"expected a string, got {type(value).__name__}")
+    return value
+
+
+def _optional_text(value):
+    """Keep a string value or None"""
+    return None if value is None else _text(value)
+
+
+def _text_list(value):
+    """Copy a list of strings"""
+    items = _list(value)
+    for item in items:
+        _text(item)
+    return items
+
+
+def _flag(value):
+    """Keep a boolean value - anything else is invalid"""
+    if not isinstance(value, bool):
+        raise TypeError(f"expected a boolean, got {type(value).__name__}")
+    return value
+
+
+def _literal(model, field):
+    """Converter accepting only the values allowed by a model's Literal field"""
+    allowed = frozenset(get_args(model.model_fields[field].annotation))
+    
+    def convert(value):
+        if value not in allowed:
+            raise ValueError(f"{value!r} is not a valid {model.__name__}.{field}")
+        return value
+    return convert
+
+
+def _not_identified(value):
+    """Keep a free text value, or mark it not identified when Gemini left it empty"""
+    return _text(value) if value else 'Not identified'
+
+
+_element_type = _literal(PolitenessAnalysis.PolitenessElement, 'element_type')
+_element_speaker = _literal(PolitenessAnalysis.PolitenessElement, 'speaker')
+
+
+def _politeness_element_type(value):
+    """Map Gemini's element types to the PolitenessElement ones"""
+    return _element_type('courtesy_phrase' if value == 'courtesy' else value)
+
+
+def _politeness_speaker(value):
+    """Attribute system politeness elements to the agent"""
+    return _element_speaker('agent' if value == 'system' else value)
+
+
+def _member(enum, default):
+    """Converter looking a value up among an enum's members, falling back to default for unknown values"""
+    by_value = enum._BY_VALUE
+    return lambda value: by_value.get(value, default)
+
+
+def _members(enum):
+    """Converter looking a list of values up among an enum's members, dropping unknown values"""
+    by_value = enum._BY_VALUE
+    return lambda values: [by_value[value] for value in _list(values) if value in by_value]
+
+
+_language = _member(Language, Language.UNKNOWN)
+_emotional_tone = _member(EmotionalTone, EmotionalTone.NEUTRAL)
+_satisfaction_level = _member(SatisfactionLevel, SatisfactionLevel.NEUTRAL)
+_problem_status = _member(ProblemStatus, ProblemStatus.PENDING)
+_category = _member(ConversationCategory, ConversationCategory.OTHER)
+_stages = _members(ConversationStage)
+_categories = _members(ConversationCategory)
+
+
+# Shared read-only defaults for missing sections and lists - the parser only reads them
+_EMPTY = MappingProxyType({})
+_EMPTY_LIST = ()
+
+# Most segments kept per transcription and translation
+MAX_SEGMENTS = 100
+
+# Field tables: field -> (converter, default), built once at import
+# Every field has a converter that checks its value against the model's type, so the
+# models can be built with model_construct(); list converters copy the value and reject non-lists
+TRANSCRIPTION_FIELDS = {
+    'original_language': (_language, 'unknown'),
+    'full_text': (_text, ''),
+    'total_duration_seconds': (float, 0),
+    'transcription_confidence': (float, 0.9),
+}
+
+TRANSLATION_FIELDS = {
+    'full_translated_text': (_text, ''),
+    'translation_notes': (_optional_text, None),
+}
+
+SEGMENT_FIELDS = {
+    'speaker': (_literal(TranscriptionSegment, 'speaker'), 'agent'),
+    'text': (_text, ''),
+    'start_time': (float, 0),
+    'end_time': (float, 0),
+    'confidence': (float, 0.9),
+}
+
+# Translated segments always carry a fixed confidence
+TRANSLATED_SEGMENT_FIELDS = {field: spec for field, spec in SEGMENT_FIELDS.items() if field != 'confidence'}
+
+EMOTIONAL_ANALYSIS_FIELDS = {
+    'customer_overall_emotion': (_emotional_tone, 'neutral'),
+    'customer_emotion_summary': (_text, ''),
+    'agent_overall_tone': (_emotional_tone, 'neutral'),
+    'agent_empathy_score': (float, 50),
+    'agent_politeness_score': (float, 50),
+    'agent_respect_score': (float, 50),
+    'tone_appropriateness_score': (float, 50),
+    'recommendations': (_text_list, ()),
+}
+
+EMOTIONAL_MOMENT_FIELDS = {
+    'timestamp': (float, 0),
+    'emotion': (_emotional_tone, 'neutral'),
+    'intensity': (float, 0.5),
+    'trigger_phrase': (_optional_text, None),
+}
+
+TONE_MISMATCH_FIELDS = {
+    'timestamp': (float, 0),
+    'customer_tone': (_text, 'neutral'),
+    'agent_tone': (_text, 'neutral'),
+    'mismatch_severity': (_literal(ToneMismatch, 'mismatch_severity'), 'medium'),
+    'recommendation': (_text, ''),
+}
+
+STRUCTURE_ANALYSIS_FIELDS = {
+    'expected_stages': (_stages, ()),
+    'missing_stages': (_stages, ()),
+    'out_of_order_stages': (_stages, ()),
+    'structure_compliance_score': (float, 50),
+    'major_deviations': (_text_list, ()),
+    'structure_summary': (_text, ''),
+}
+
+STAGE_FIELDS = {
+    'stage': (ConversationStage._BY_VALUE.__getitem__, 'greeting'),  # Unknown stages skip the item
+    'present': (_flag, True),
+    'start_time': (float, 0),
+    'end_time': (float, 0),
+    'quality_score': (float, 75),
+    'deviations': (_text_list, ()),
+}
+
+SATISFACTION_ANALYSIS_FIELDS = {
+    'overall_satisfaction': (_satisfaction_level, 'neutral'),
+    'satisfaction_score': (float, 50),
+    'positive_signals': (_text_list, ()),
+    'negative_signals': (_text_list, ()),
+    'satisfaction_trend': (_literal(SatisfactionAnalysis, 'satisfaction_trend'), 'stable'),
+    'end_call_satisfaction': (_satisfaction_level, 'neutral'),
+    'requires_follow_up': (bool, False),
+    'follow_up_reason': (_optional_text, None),
+}
+
+SATISFACTION_INDICATOR_FIELDS = {
+    'timestamp': (float, 0),
+    'indicator_type': (_literal(SatisfactionAnalysis.SatisfactionIndicator, 'indicator_type'), 'phrase'),
+    'content': (_text, ''),
+    'impact': (_literal(SatisfactionAnalysis.SatisfactionIndicator, 'impact'), 'neutral'),
+    'confidence': (float, 0.5),
+}
+
+POLITENESS_ANALYSIS_FIELDS = {
+    'agent_greeting_present': (bool, False),
+    'agent_farewell_present': (bool, False),
+    'agent_thanks_present': (bool, False),
+    'agent_apologies_count': (int, 0),
+    'customer_greeting_present': (bool, False),
+    'customer_farewell_present': (bool, False),
+    'customer_thanks_present': (bool, False),
+    'politeness_score': (float, 50),
+    'missing_required_elements': (_text_list, ()),
+    'cultural_appropriateness_score': (float, 50),
+    'recommendations': (_text_list, ()),
+}
+
+POLITENESS_ELEMENT_FIELDS = {
+    'element_type': (_politeness_element_type, 'greeting'),
+    'speaker': (_politeness_speaker, 'agent'),
+    'timestamp': (float, 0),
+    'text': (_text, ''),
+    'culturally_appropriate': (bool, True),
+}
+
+RESOLUTION_ANALYSIS_FIELDS = {
+    'problem_statement': (_not_identified, None),
+    'problem_category': (_category, 'other'),
+    'resolution_status': (_problem_status, 'pending'),
+    'resolution_confidence': (float, 0.5),
+    'unresolved_indicators': (_text_list, ()),
+    'customer_confirmation_of_resolution': (bool, False),
+    'requires_escalation': (bool, False),
+    'escalation_reason': (_optional_text, None),
+    'recommended_next_steps': (_text_list, ()),
+    'supervisor_review_required': (bool, False),
+    'review_priority': (_literal(ResolutionAnalysis, 'review_priority'), 'medium'),
+}
+
+RESOLUTION_ATTEMPT_FIELDS = {
+    'timestamp': (str, '0'),
+    'action': (_text, ''),
+    'success': (str, 'false'),
+}
+
+PAUSE_ANALYSIS_FIELDS = {
+    'total_pauses': (int, 0),
+    'total_pause_duration': (float, 0),
+    'average_pause_duration': (float, 0),
+    'longest_pause_duration': (float, 0),
+    'unannounced_long_pauses': (int, 0),
+    'compliance_score': (float, 100),
+    'pause_handling_issues': (_text_list, ()),
+    'recommendations': (_text_list, ()),
+}
+
+PAUSE_FIELDS = {
+    'start_time': (float, 0),
+    'end_time': (float, 0),
+    'duration_seconds': (float, 0),
+    'announced': (bool, False),
+    'announcement_text': (_optional_text, ''),
+    'reason_given': (_optional_text, ''),
+    'customer_response': (_optional_text, None),
+}
+
+SUMMARY_FIELDS = {
+    'summary_lt': (_text, ''),
+    'key_points_lt': (_text_list, ()),
+    'customer_request': (_not_identified, None),
+    'actions_taken': (_text_list, ()),
+    'outcome': (_text, ''),
+    'follow_up_required': (bool, False),
+    'follow_up_actions': (_text_list, ()),
+    'agent_performance_notes': (_text, ''),
+    'improvement_suggestions': (_text_list, ()),
+}
+
+CATEGORIZATION_FIELDS = {
+    'primary_category': (_category, 'other'),
+    'secondary_categories': (_categories, ()),
+    'tags': (_text_list, ()),
+    'customer_type': (_literal(ConversationCategorization, 'customer_type'), 'unknown'),
+    'service_mentioned': (_text_list, ()),
+    'urgency_level': (_literal(ConversationCategorization, 'urgency_level'), 'normal'),
+    'searchable_keywords': (_text_list, ()),
+    'auto_generated_labels': (_text_list, ()),
+}
+
+OVERALL_FIELDS = {
+    'requires_immediate_review': (bool, False),
+    'critical_issues': (_text_list, ()),
+    'top_recommendations': (_text_list, ()),
+}
+
+# Alternative key names Gemini uses for some item fields: alias -> field
+SEGMENT_ALIASES = {'timestamp_start': 'start_time', 'timestamp_end': 'end_time'}
+EMOTIONAL_MOMENT_ALIASES = {'confidence': 'intensity', 'trigger': 'trigger_phrase'}
+SATISFACTION_INDICATOR_ALIASES = {'indicator': 'content', 'sentiment': 'impact', 'weight': 'confidence'}
+PAUSE_ALIASES = {
+    'timestamp_start': 'start_time',
+    'timestamp_end': 'end_time',
+    'duration': 'duration_seconds',
+    'announcement': 'announcement_text',
+    'reason': 'reason_given',
+}
+
+# Sections parsed the same way: response key -> (model, field table, list fields)
+# List fields: field -> (item field table, item aliases, item model, fixed item values)
+SECTION_SPECS = {
+    'emotional_analysis': (EmotionalAnalysis, EMOTIONAL_ANALYSIS_FIELDS, {
+        'customer_emotion_progression': (EMOTIONAL_MOMENT_FIELDS, EMOTIONAL_MOMENT_ALIASES, EmotionalAnalysis.EmotionalMoment, {'speaker': 'customer'}),
+        'tone_mismatches': (TONE_MISMATCH_FIELDS, {}, ToneMismatch, {}),
+    }),
+    'structure_analysis': (ConversationStructure, STRUCTURE_ANALYSIS_FIELDS, {
+        'detected_stages': (STAGE_FIELDS, SEGMENT_ALIASES, ConversationStructure.StageOccurrence, {}),
+    }),
+    'satisfaction_analysis': (SatisfactionAnalysis, SATISFACTION_ANALYSIS_FIELDS, {
+        'satisfaction_indicators': (SATISFACTION_INDICATOR_FIELDS, SATISFACTION_INDICATOR_ALIASES, SatisfactionAnalysis.SatisfactionIndicator, {}),
+    }),
+    'politeness_analysis': (PolitenessAnalysis, POLITENESS_ANALYSIS_FIELDS, {
+        'detected_elements': (POLITENESS_ELEMENT_FIELDS, {}, PolitenessAnalysis.PolitenessElement, {}),
+    }),
+    'resolution_analysis': (ResolutionAnalysis, RESOLUTION_ANALYSIS_FIELDS, {
+        'resolution_attempts': (RESOLUTION_ATTEMPT_FIELDS, {}, ResolutionAttempt, {}),
+    }),
+    'pause_analysis': (PauseAnalysis, PAUSE_ANALYSIS_FIELDS, {
+        'long_pauses': (PAUSE_FIELDS, PAUSE_ALIASES, PauseAnalysis.Pause, {}),
+    }),
+    'summary': (ConversationSummary, SUMMARY_FIELDS, {}),
+    'categorization': (ConversationCategorization, CATEGORIZATION_FIELDS, {}),
+}
+
+# Pauses longer than this must be announced to the customer
+LONG_PAUSE_SECONDS = 60
+
+
+def _derive_pause_statistics(values: Dict):
+    """Recompute the pause figures that follow from the parsed long pauses, so they agree with the list"""
+    # Gemini sometimes gives only a pause's start and end - its duration then follows from them
+    long_pauses = values['long_pauses'] = [
+        pause if pause.duration_seconds else pause.model_copy(
+            update={'duration_seconds': max(pause.end_time - pause.start_time, 0.0)}
+        )
+        for pause in values['long_pauses']
+    ]
+    values['unannounced_long_pauses'] = sum(
+        1 for pause in long_pauses
+        if not pause.announced and pause.duration_seconds > LONG_PAUSE_SECONDS
+    )
+    # The reported figure also covers pauses not listed, so it can only grow
+    values['longest_pause_duration'] = max(
+        [values['longest_pause_duration'], *(pause.duration_seconds for pause in long_pauses)]
+    )
+
+
+# Sections with figures derived from their parsed values: response key -> function updating the values
+SECTION_DERIVATIONS = {
+    'pause_analysis': _derive_pause_statistics,
+}
+
+
+def _normalize(data: Dict, aliases: Dict) -> Dict:
+    """Rename alias keys to their field names in one pass - a field's own key wins over its alias"""
+    if not aliases:
+        return data
+    normalized = {aliases[key]: value for key, value in data.items() if key in aliases}
+    normalized.update(data)
+    return normalized
+
+
+def _parse_fields(data: Dict, fields: Dict) -> Dict[str, Any]:
+    """Convert the fields of one response dict according to a field table"""
+    values = {}
+    for field, (converter, default) in fields.items():
+        values[field] = converter(data.get(field, default))
+    return values
+
+
+def _builder(model, validate: bool):
+    """Constructor for a model's already converted values - validating only when asked to"""
+    return model if validate else model.model_construct
+
+
+def _parse_items(items: List, fields: Dict, aliases: Dict, model, fixed: Dict = _EMPTY, validate: bool = False,
+                 limit: Optional[int] = None) -> List:
+    """Parse a list of response dicts into models, skipping invalid items and stopping after limit valid ones"""
+    build = _builder(model, validate)  # Same for every item, so resolved once
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue  # Skip malformed items
+        try:
+            values = _parse_fields(_normalize(item, aliases), fields)
+            values.update(fixed)
+            parsed.append(build(**values))
+        except (TypeError, ValueError, KeyError):
+            continue  # Skip items with unconvertible values (pydantic's ValidationError is a ValueError)
+        if len(parsed) == limit:
+            break
+    return parsed
+
+
+def _parse_section(section_data: Dict, model, fields: Dict, list_fields: Dict, validate: bool = False, derive=None):
+    """Parse one analysis section according to its SECTION_SPECS and SECTION_DERIVATIONS entries"""
+    values = _parse_fields(section_data, fields)
+    for field, (item_fields, aliases, item_model, fixed) in list_fields.items():
+        values[field] = _parse_items(section_data.get(field, _EMPTY_LIST), item_fields, aliases, item_model, fixed, validate)
+    if derive is not None:
+        derive(values)
+    return _builder(model, validate)(**values)
+
+
+def parse_gemini_response(data, session_id: str, processing_duration_ms: int, validate: bool = False) -> ComprehensiveCallAnalysis:
     """
     Parse Gemini JSON response into ComprehensiveCallAnalysis
     Handles missing fields and type conversions
-    """
-    from datetime import datetime
     
+    The field tables convert and check every value against the model types
+    (invalid items are skipped, an invalid section field raises), so models are
+    built with model_construct() and skip validation - pass validate=True to
+    build them through pydantic's validation while debugging.
+    """
     # Handle list response (take first item if it's a list)
     if isinstance(data, list):
         if len(data) > 0:
             data = data[0]
         else:
-            data = {}
+            data = _EMPTY
     
     # Ensure we have a dict
     if not isinstance(data, dict):
-        data = {}
-    
-    # Parse transcription
-    transcription_data = data.get('transcription', {})
-    segments = []
-    for seg in transcription_data.get('segments', []):
-        try:
-            segments.append(TranscriptionSegment(
-                speaker=seg.get('speaker', 'agent'),
-                text=seg.get('text', ''),
-                start_time=float(seg.get('start_time', seg.get('timestamp_start', 0))),
-                end_time=float(seg.get('end_time', seg.get('timestamp_end', 0))),
-                confidence=float(seg.get('confidence', 0.9)),
-                original_language=Language(transcription_data.get('original_language', 'unknown'))
-            ))
-        except:
-            continue  # Skip invalid segments
+        data = _EMPTY
     
-    transcription = Transcription(
-        original_language=Language(transcription_data.get('original_language', 'unknown')),
-        segments=segments[:100],  # Limit segments
-        full_text=transcription_data.get('full_text', ''),
-        total_duration_seconds=float(transcription_data.get('total_duration_seconds', 0)),
-        transcription_confidence=float(transcription_data.get('transcription_confidence', 0.9)),
-        word_count=int(transcription_data.get('word_count', 0))
+    # Parse transcription - segments share the transcription's language
+    transcription_data = data.get('transcription', _EMPTY)
+    transcription_fields = _parse_fields(transcription_data, TRANSCRIPTION_FIELDS)
+    language = transcription_fields['original_language']
+    segments = _parse_items(
+        transcription_data.get('segments', _EMPTY_LIST), SEGMENT_FIELDS, SEGMENT_ALIASES,
+        TranscriptionSegment, {'original_language': language}, validate, MAX_SEGMENTS
     )
+    transcription_fields['segments'] = segments
+    transcription_fields['word_count'] = len(transcription_fields['full_text'].split())  # As the word_count validator derives
+    transcription = _builder(Transcription, validate)(**transcription_fields)
     
     # Parse translation
-    translation_data = data.get('translation', {})
-    translated_segments = []
-    for seg in translation_data.get('translated_segments', []):
-        try:
-            translated_segments.append(TranscriptionSegment(
-                speaker=seg.get('speaker', 'agent'),
-                text=seg.get('text', ''),
-                start_time=float(seg.get('start_time', seg.get('timestamp_start', 0))),
-                end_time=float(seg.get('end_time', seg.get('timestamp_end', 0))),
-                confidence=0.95,
-                original_language=Language(transcription_data.get('original_language', 'unknown'))
-            ))
-        except:
-            continue
-    
-    translation = Translation(
-        target_language="lt",
-        translated_segments=translated_segments[:100],
-        full_translated_text=translation_data.get('full_translated_text', ''),
-        translation_notes=translation_data.get('translation_notes')
+    translation_data = data.get('translation', _EMPTY)
+    translated_segments = _parse_items(
+        translation_data.get('translated_segments', _EMPTY_LIST), TRANSLATED_SEGMENT_FIELDS, SEGMENT_ALIASES,
+        TranscriptionSegment, {'confidence': 0.95, 'original_language': language}, validate, MAX_SEGMENTS
     )
+    translation_fields = _parse_fields(translation_data, TRANSLATION_FIELDS)
+    translation_fields['target_language'] = "lt"
+    translation_fields['translated_segments'] = translated_segments
+    translation = _builder(Translation, validate)(**translation_fields)
     
-    # Parse emotional analysis
-    emotional_data = data.get('emotional_analysis', {})
-    emotion_progression = []
-    for prog in emotional_data.get('customer_emotion_progression', []):
-        try:
-            emotion_progression.append({
-                'timestamp': float(prog.get('timestamp', 0)),
-                'speaker': 'customer',
-                'emotion': prog.get('emotion', 'neutral'),
-                'intensity': float(prog.get('intensity', prog.get('confidence', 0.5))),
-                'trigger_phrase': prog.get('trigger_phrase', prog.get('trigger'))
-            })
-        except:
-            continue
-    
-    tone_mismatches = []
-    for mismatch in emotional_data.get('tone_mismatches', []):
-        try:
-            tone_mismatches.append(ToneMismatch(
-                timestamp=float(mismatch.get('timestamp', 0)),
-                customer_tone=mismatch.get('customer_tone', 'neutral'),
-                agent_tone=mismatch.get('agent_tone', 'neutral'),
-                mismatch_severity=mismatch.get('mismatch_severity', 'medium'),
-                recommendation=mismatch.get('recommendation', '')
-            ))
-        except:
-            continue
-    
-    emotional_analysis = EmotionalAnalysis(
-        customer_overall_emotion=EmotionalTone(emotional_data.get('customer_overall_emotion', 'neutral')),
-        customer_emotion_progression=emotion_progression,
-        customer_emotion_summary=emotional_data.get('customer_emotion_summary', ''),
-        agent_overall_tone=EmotionalTone(emotional_data.get('agent_overall_tone', 'neutral')),
-        agent_empathy_score=float(emotional_data.get('agent_empathy_score', 50)),
-        agent_politeness_score=float(emotional_data.get('agent_politeness_score', 50)),
-        agent_respect_score=float(emotional_data.get('agent_respect_score', 50)),
-        tone_appropriateness_score=float(emotional_data.get('tone_appropriateness_score', 50)),
-        tone_mismatches=tone_mismatches,
-        recommendations=emotional_data.get('recommendations', [])
-    )
-    
-    # Parse structure analysis
-    structure_data = data.get('structure_analysis', {})
-    detected_stages = []
-    for stage in structure_data.get('detected_stages', []):
-        try:
-            detected_stages.append({
-                'stage': stage.get('stage', 'greeting'),
-                'present': stage.get('present', True),
-                'start_time': float(stage.get('start_time', stage.get('timestamp_start', 0))),
-                'end_time': float(stage.get('end_time', stage.get('timestamp_end', 0))),
-                'quality_score': float(stage.get('quality_score', 75)),
-                'deviations': stage.get('deviations', [])
-            })
-        except:
-            continue
-    
-    structure_analysis = ConversationStructure(
-        detected_stages=detected_stages,
-        expected_stages=structure_data.get('expected_stages', []),
-        missing_stages=structure_data.get('missing_stages', []),
-        out_of_order_stages=structure_data.get('out_of_order_stages', []),
-        structure_compliance_score=float(structure_data.get('structure_compliance_score', 50)),
-        major_deviations=structure_data.get('major_deviations', []),
-        structure_summary=structure_data.get('structure_summary', '')
-    )
-    
-    # Parse satisfaction analysis
-    satisfaction_data = data.get('satisfaction_analysis', {})
-    satisfaction_indicators = []
-    for ind in satisfaction_data.get('satisfaction_indicators', []):
-        try:
-            satisfaction_indicators.append({
-                'timestamp': float(ind.get('timestamp', 0)),
-                'indicator_type': ind.get('indicator_type', 'phrase'),
-                'content': ind.get('content', ind.get('indicator', '')),
-                'impact': ind.get('impact', ind.get('sentiment', 'neutral')),
-                'confidence': float(ind.get('confidence', ind.get('weight', 0.5)))
-            })
-        except:
-            continue
-    
-    satisfaction_analysis = SatisfactionAnalysis(
-        overall_satisfaction=SatisfactionLevel(satisfaction_data.get('overall_satisfaction', 'neutral')),
-        satisfaction_score=float(satisfaction_data.get('satisfaction_score', 50)),
-        satisfaction_indicators=satisfaction_indicators,
-        positive_signals=satisfaction_data.get('positive_signals', []),
-        negative_signals=satisfaction_data.get('negative_signals', []),
-        satisfaction_trend=satisfaction_data.get('satisfaction_trend', 'stable'),
-        end_call_satisfaction=SatisfactionLevel(satisfaction_data.get('end_call_satisfaction', 'neutral')),
-        requires_follow_up=bool(satisfaction_data.get('requires_follow_up', False)),
-        follow_up_reason=satisfaction_data.get('follow_up_reason')
-    )
-    
-    # Parse politeness analysis
-    politeness_data = data.get('politeness_analysis', {})
-    detected_elements = []
-    for elem in politeness_data.get('detected_elements', []):
-        try:
-            # Map element types
-            elem_type = elem.get('element_type', 'greeting')
-            if elem_type == 'courtesy':
-                elem_type = 'courtesy_phrase'
-            
-            detected_elements.append({
-                'element_type': elem_type,
-                'speaker': elem.get('speaker', 'agent') if elem.get('speaker') != 'system' else 'agent',
-                'timestamp': float(elem.get('timestamp', 0)),
-                'text': elem.get('text', ''),
-                'culturally_appropriate': bool(elem.get('culturally_appropriate', True))
-            })
-        except:
-            continue
-    
-    politeness_analysis = PolitenessAnalysis(
-        detected_elements=detected_elements,
-        agent_greeting_present=bool(politeness_data.get('agent_greeting_present', False)),
-        agent_farewell_present=bool(politeness_data.get('agent_farewell_present', False)),
-        agent_thanks_present=bool(politeness_data.get('agent_thanks_present', False)),
-        agent_apologies_count=int(politeness_data.get('agent_apologies_count', 0)),
-        customer_greeting_present=bool(politeness_data.get('customer_greeting_present', False)),
-        customer_farewell_present=bool(politeness_data.get('customer_farewell_present', False)),
-        customer_thanks_present=bool(politeness_data.get('customer_thanks_present', False)),
-        politeness_score=float(politeness_data.get('politeness_score', 50)),
-        missing_required_elements=politeness_data.get('missing_required_elements', []),
-        cultural_appropriateness_score=float(politeness_data.get('cultural_appropriateness_score', 50)),
-        recommendations=politeness_data.get('recommendations', [])
-    )
-    
-    # Parse resolution analysis
-    resolution_data = data.get('resolution_analysis', {})
-    resolution_attempts = []
-    for attempt in resolution_data.get('resolution_attempts', []):
-        try:
-            resolution_attempts.append(ResolutionAttempt(
-                timestamp=str(attempt.get('timestamp', '0')),
-                action=attempt.get('action', ''),
-                success=str(attempt.get('success', 'false'))
-            ))
-        except:
-            continue
-    
-    resolution_analysis = ResolutionAnalysis(
-        problem_statement=resolution_data.get('problem_statement') or 'Not identified',
-        problem_category=ConversationCategory(resolution_data.get('problem_category', 'other')),
-        resolution_status=ProblemStatus(resolution_data.get('resolution_status', 'pending')),
-        resolution_confidence=float(resolution_data.get('resolution_confidence', 0.5)),
-        unresolved_indicators=resolution_data.get('unresolved_indicators', []),
-        resolution_attempts=resolution_attempts,
-        customer_confirmation_of_resolution=bool(resolution_data.get('customer_confirmation_of_resolution', False)),
-        requires_escalation=bool(resolution_data.get('requires_escalation', False)),
-        escalation_reason=resolution_data.get('escalation_reason'),
-        recommended_next_steps=resolution_data.get('recommended_next_steps', []),
-        supervisor_review_required=bool(resolution_data.get('supervisor_review_required', False)),
-        review_priority=resolution_data.get('review_priority', 'medium')
-    )
-    
-    # Parse pause analysis
-    pause_data = data.get('pause_analysis', {})
-    long_pauses = []
-    for pause in pause_data.get('long_pauses', []):
-        try:
-            long_pauses.append({
-                'timestamp_start': float(pause.get('timestamp_start', 0)),
-                'timestamp_end': float(pause.get('timestamp_end', 0)),
-                'duration': float(pause.get('duration', 0)),
-                'announced': bool(pause.get('announced', False)),
-                'announcement': pause.get('announcement', ''),
-                'reason': pause.get('reason', '')
-            })
-        except:
-            continue
-    
-    pause_analysis = PauseAnalysis(
-        total_pauses=int(pause_data.get('total_pauses', 0)),
-        long_pauses=long_pauses,
-        total_pause_duration=float(pause_data.get('total_pause_duration', 0)),
-        average_pause_duration=float(pause_data.get('average_pause_duration', 0)),
-        longest_pause_duration=float(pause_data.get('longest_pause_duration', 0)),
-        unannounced_long_pauses=int(pause_data.get('unannounced_long_pauses', 0)),
-        compliance_score=float(pause_data.get('compliance_score', 100)),
-        pause_handling_issues=pause_data.get('pause_handling_issues', []),
-        recommendations=pause_data.get('recommendations', [])
-    )
-    
-    # Parse summary
-    summary_data = data.get('summary', {})
-    summary = ConversationSummary(
-        summary_lt=summary_data.get('summary_lt', ''),
-        key_points_lt=summary_data.get('key_points_lt', []),
-        customer_request=summary_data.get('customer_request') or 'Not identified',
-        actions_taken=summary_data.get('actions_taken', []),
-        outcome=summary_data.get('outcome', ''),
-        follow_up_required=bool(summary_data.get('follow_up_required', False)),
-        follow_up_actions=summary_data.get('follow_up_actions', []),
-        agent_performance_notes=summary_data.get('agent_performance_notes', ''),
-        improvement_suggestions=summary_data.get('improvement_suggestions', [])
-    )
-    
-    # Parse categorization
-    categorization_data = data.get('categorization', {})
-    categorization = ConversationCategorization(
-        primary_category=ConversationCategory(categorization_data.get('primary_category', 'other')),
-        secondary_categories=categorization_data.get('secondary_categories', []),
-        tags=categorization_data.get('tags', []),
-        customer_type=categorization_data.get('customer_type', 'unknown'),
-        service_mentioned=categorization_data.get('service_mentioned', []),
-        urgency_level=categorization_data.get('urgency_level', 'normal'),
-        searchable_keywords=categorization_data.get('searchable_keywords', []),
-        auto_generated_labels=categorization_data.get('auto_generated_labels', [])
-    )
+    # Parse the analysis sections
+    sections = {
+        key: _parse_section(data.get(key, _EMPTY), *spec, validate, SECTION_DERIVATIONS.get(key))
+        for key, spec in SECTION_SPECS.items()
+    }
     
     # Create the comprehensive analysis
-    return ComprehensiveCallAnalysis(
+    analysis_fields = _parse_fields(data, OVERALL_FIELDS)
+    analysis_fields.update(sections)
+    analysis_fields.update(
         session_id=session_id,
         analysis_timestamp=datetime.now(),
         processing_duration_ms=processing_duration_ms,
         transcription=transcription,
         translation=translation,
-        emotional_analysis=emotional_analysis,
-        structure_analysis=structure_analysis,
-        satisfaction_analysis=satisfaction_analysis,
-        politeness_analysis=politeness_analysis,
-        resolution_analysis=resolution_analysis,
-        pause_analysis=pause_analysis,
-        summary=summary,
-        categorization=categorization,
-        overall_quality_score=float(data.get('overall_quality_score', 50)),
-        requires_immediate_review=bool(data.get('requires_immediate_review', False)),
-        critical_issues=data.get('critical_issues', []),
-        top_recommendations=data.get('top_recommendations', [])
-    )
\ No newline at end of file
+        # As the overall_quality_score validator derives
+        overall_quality_score=calculate_quality_score(
+            sections['emotional_analysis'],
+            sections['structure_analysis'],
+            sections['satisfaction_analysis'],
+            sections['politeness_analysis']
+        )
+    )
+    return _builder(ComprehensiveCallAnalysis, validate)(**analysis_fields)
+    
\ No newline at end of file
@@ -3,14 +3,27 @@ Pydantic models for structured Gemini API outputs
 Detailed schemas for call analysis requirements
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from typing import List, Optional, Dict, Literal
 from datetime import datetime
-from enum import Enum
+from enum import Enum, EnumMeta
+
+
+class FastEnumMeta(EnumMeta):
+    """Enum metaclass building each enum's value -> member dict once, at class creation"""
+    
+    def __new__(metacls, cls, bases, classdict, **kwds):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwds)
+        enum_class._BY_VALUE = {member.value: member for member in enum_class}
+        return enum_class
+
+
+class FastEnum(str, Enum, metaclass=FastEnumMeta):
+    """String enum whose members can be looked up by value in _BY_VALUE, without Enum's call machinery"""
 
 
 # Enums for structured categories
-class Language(str, Enum):
+class Language(FastEnum):
     LITHUANIAN = "lt"
     ENGLISH = "en"
     RUSSIAN = "ru"
@@ -18,7 +31,7 @@ class Language(str, Enum):
     UNKNOWN = "unknown"
 
 
-class EmotionalTone(str, Enum):
+class EmotionalTone(FastEnum):
     POSITIVE = "positive"
     NEUTRAL = "neutral"
     NEGATIVE = "negative"
@@ -28,7 +41,7 @@ class EmotionalTone(str, Enum):
     CONFUSED = "confused"
 
 
-class ConversationStage(str, Enum):
+class ConversationStage(FastEnum):
     GREETING = "greeting"
     PROBLEM_IDENTIFICATION = "problem_identification"
     INFORMATION_GATHERING = "information_gathering"
@@ -38,7 +51,7 @@ class ConversationStage(str, Enum):
     FAREWELL = "farewell"
 
 
-class SatisfactionLevel(str, Enum):
+class SatisfactionLevel(FastEnum):
     VERY_SATISFIED = "very_satisfied"
     SATISFIED = "satisfied"
     NEUTRAL = "neutral"
@@ -46,7 +59,7 @@ class SatisfactionLevel(str, Enum):
     VERY_DISSATISFIED = "very_dissatisfied"
 
 
-class ProblemStatus(str, Enum):
+class ProblemStatus(FastEnum):
     RESOLVED = "resolved"
     PARTIALLY_RESOLVED = "partially_resolved"
     UNRESOLVED = "unresolved"
@@ -54,7 +67,7 @@ class ProblemStatus(str, Enum):
     PENDING = "pending"
 
 
-class ConversationCategory(str, Enum):
+class ConversationCategory(FastEnum):
     GENERAL_INFO = "general_info"
     APPLICATION_INQUIRY = "application_inquiry"
     TECHNICAL_SUPPORT = "technical_support"
@@ -65,9 +78,28 @@ class ConversationCategory(str, Enum):
     OTHER = "other"
 
 
+# Sections whose scores make up the overall quality score, in calculate_quality_score's argument order
+QUALITY_SCORE_SECTIONS = ('emotional_analysis', 'structure_analysis', 'satisfaction_analysis', 'politeness_analysis')
+
+
+def calculate_quality_score(emotional_analysis, structure_analysis, satisfaction_analysis, politeness_analysis) -> float:
+    """Weighted average of the section scores, the overall quality score of a call"""
+    return (
+        emotional_analysis.tone_appropriateness_score * 0.25
+        + structure_analysis.structure_compliance_score * 0.20
+        + satisfaction_analysis.satisfaction_score * 0.30
+        + politeness_analysis.politeness_score * 0.25
+    )
+
+
+class FrozenModel(BaseModel):
+    """Base for the analysis models - analyses are read-only once built"""
+    model_config = ConfigDict(frozen=True)
+
+
 # Detailed models for each requirement
 
-class TranscriptionSegment(BaseModel):
+class TranscriptionSegment(FrozenModel):
     """Individual segment of transcription"""
     speaker: Literal["customer", "agent", "system"]
     text: str
@@ -77,7 +109,7 @@ class TranscriptionSegment(BaseModel):
     original_language: Language
 
 
-class Transcription(BaseModel):
+class Transcription(FrozenModel):
     """R_Base: Complete transcription in original language"""
     original_language: Language
     segments: List[TranscriptionSegment]
@@ -86,14 +118,15 @@ class Transcription(BaseModel):
     transcription_confidence: float = Field(description="Overall transcription confidence between 0.0 and 1.0")
     word_count: int
     
-    @validator('word_count', always=True)
-    def calculate_word_count(cls, v, values):
-        if 'full_text' in values:
-            return len(values['full_text'].split())
+    @field_validator('word_count')
+    @classmethod
+    def calculate_word_count(cls, v, info: ValidationInfo):
+        if 'full_text' in info.data:
+            return len(info.data['full_text'].split())
         return v
 
 
-class Translation(BaseModel):
+class Translation(FrozenModel):
     """R_Translation: Lithuanian translation of the conversation"""
     target_language: str = Field(description="Target language for translation (always 'lt')")
     translated_segments: List[TranscriptionSegment]
@@ -103,7 +136,7 @@ class Translation(BaseModel):
     )
 
 
-class ToneMismatch(BaseModel):
+class ToneMismatch(FrozenModel):
     """Tone mismatch instance"""
     timestamp: float
     customer_tone: str
@@ -112,17 +145,17 @@ class ToneMismatch(BaseModel):
     recommendation: str
 
 
-class ResolutionAttempt(BaseModel):
+class ResolutionAttempt(FrozenModel):
     """Single resolution attempt by agent"""
     timestamp: str
     action: str
     success: str
 
 
-class EmotionalAnalysis(BaseModel):
+class EmotionalAnalysis(FrozenModel):
     """R_13: Emotional Tone Assessment"""
     
-    class EmotionalMoment(BaseModel):
+    class EmotionalMoment(FrozenModel):
         timestamp: float
         speaker: Literal["customer", "agent"]
         emotion: EmotionalTone
@@ -147,10 +180,10 @@ class EmotionalAnalysis(BaseModel):
     )
 
 
-class ConversationStructure(BaseModel):
+class ConversationStructure(FrozenModel):
     """R_14: Conversation Structure Classification"""
     
-    class StageOccurrence(BaseModel):
+    class StageOccurrence(FrozenModel):
         stage: ConversationStage
         present: bool
         start_time: Optional[float]
@@ -167,10 +200,10 @@ class ConversationStructure(BaseModel):
     structure_summary: str
 
 
-class SatisfactionAnalysis(BaseModel):
+class SatisfactionAnalysis(FrozenModel):
     """R_15: Customer Satisfaction Detection"""
     
-    class SatisfactionIndicator(BaseModel):
+    class SatisfactionIndicator(FrozenModel):
         timestamp: float
         indicator_type: Literal["phrase", "sentiment", "tone"]
         content: str
@@ -190,10 +223,10 @@ class SatisfactionAnalysis(BaseModel):
     follow_up_reason: Optional[str]
 
 
-class PolitenessAnalysis(BaseModel):
+class PolitenessAnalysis(FrozenModel):
     """R_16: Politeness Elements Analysis"""
     
-    class PolitenessElement(BaseModel):
+    class PolitenessElement(FrozenModel):
         element_type: Literal["greeting", "farewell", "thanks", "apology", "please", "courtesy_phrase"]
         text: str
         speaker: Literal["customer", "agent"]
@@ -219,7 +252,7 @@ class PolitenessAnalysis(BaseModel):
     recommendations: List[str]
 
 
-class ResolutionAnalysis(BaseModel):
+class ResolutionAnalysis(FrozenModel):
     """R_17: Unresolved Problem Detection"""
     
     problem_statement: str = Field(description="Customer's main problem/question")
@@ -244,10 +277,10 @@ class ResolutionAnalysis(BaseModel):
     review_priority: Literal["high", "medium", "low"]
 
 
-class PauseAnalysis(BaseModel):
+class PauseAnalysis(FrozenModel):
     """R_18: Long Pause Detection"""
     
-    class Pause(BaseModel):
+    class Pause(FrozenModel):
         start_time: float
         end_time: float
         duration_seconds: float
@@ -272,7 +305,7 @@ class PauseAnalysis(BaseModel):
     recommendations: List[str]
 
 
-class ConversationSummary(BaseModel):
+class ConversationSummary(FrozenModel):
     """R_19: Post-Call Summary in Lithuanian"""
     
     summary_lt: str = Field(description="Comprehensive summary in Lithuanian")
@@ -289,7 +322,7 @@ class ConversationSummary(BaseModel):
     improvement_suggestions: List[str]
 
 
-class ConversationCategorization(BaseModel):
+class ConversationCategorization(FrozenModel):
     """Categorization for search and filtering"""
     
     primary_category: ConversationCategory
@@ -311,7 +344,7 @@ class ConversationCategorization(BaseModel):
     auto_generated_labels: List[str]
 
 
-class ComprehensiveCallAnalysis(BaseModel):
+class ComprehensiveCallAnalysis(FrozenModel):
     """Complete analysis output from Gemini 2.5 Pro"""
     
     # Basic information
@@ -349,21 +382,11 @@ class ComprehensiveCallAnalysis(BaseModel):
         description="Top 3-5 actionable recommendations"
     )
     
-    @validator('overall_quality_score', always=True)
-    def calculate_overall_score(cls, v, values):
+    @field_validator('overall_quality_score')
+    @classmethod
+    def calculate_overall_score(cls, v, info: ValidationInfo):
         """Calculate weighted average of all scores"""
-        if all(k in values for k in ['emotional_analysis', 'structure_analysis', 
-                                     'satisfaction_analysis', 'politeness_analysis']):
-            scores = [
-                values['emotional_analysis'].tone_appropriateness_score * 0.25,
-                values['structure_analysis'].structure_compliance_score * 0.20,
-                values['satisfaction_analysis'].satisfaction_score * 0.30,
-                values['politeness_analysis'].politeness_score * 0.25
-            ]
-            return sum(scores)
-        return v or 0.0
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+        values = info.data  # Fields declared before this one, already validated
+        if all(k in values for k in QUALITY_SCORE_SECTIONS):
+            return calculate_quality_score(*(values[k] for k in QUALITY_SCORE_SECTIONS))
+        return v or 0.0
\ No newline at end of file
@@ -4,7 +4,7 @@ Focuses on pause compliance and unresolved issues
 """
 
 import os
-import json
+import orjson
 from datetime import datetime
 from typing import Optional
 import google.genai as genai
@@ -160,7 +160,7 @@ class ConversationAnalysisService:
             
             # Parse the response
             if response and response.text:
-                analysis_data = json.loads(response.text)
+                analysis_data = orjson.loads(response.text)
                 
                 # Add metadata
                 analysis_data['session_id'] = session_id
@@ -4,9 +4,9 @@ Transcription service using Gemini API with structured output
 """
 
 import os
-import json
 import logging
-from typing import Optional
+import orjson
+from typing import IO, Optional, Union
 from pathlib import Path
 import google.genai as genai
 from google.cloud import storage
@@ -66,7 +66,7 @@ class TranscriptionService:
             
             if blob.exists():
                 logger.info(f"Found existing transcription for session {session_id}")
-                data = json.loads(blob.download_as_text())
+                data = orjson.loads(blob.download_as_bytes())
                 
                 # Convert to Pydantic model
                 segments = [TranscriptionSegment(**seg) for seg in data["transcription"]]
@@ -105,7 +105,7 @@ class TranscriptionService:
             }
             
             blob.upload_from_string(
-                json.dumps(data, indent=2),
+                orjson.dumps(data, option=orjson.OPT_INDENT_2),
                 content_type="application/json"
             )
             
@@ -115,13 +115,14 @@ class TranscriptionService:
             logger.error(f"Error saving transcription: {e}")
             return False
     
-    def transcribe_audio(self, audio_path: str, session_id: str) -> Optional[TranscriptionResponse]:
+    def transcribe_audio(self, audio: Union[str, IO[bytes]], session_id: str, mime_type: Optional[str] = None) -> Optional[TranscriptionResponse]:
         """
         Transcribe audio file with speaker diarization
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or a binary file object holding the audio
             session_id: Session ID for caching
+            mime_type: MIME type of the audio, required when passing a file object
             
         Returns:
             TranscriptionResponse or None if failed
@@ -133,10 +134,13 @@ class TranscriptionService:
         
         try:
             # Upload audio file to Gemini using Files API
-            logger.info(f"Uploading audio file: {audio_path}")
+            logger.info(f"Uploading audio for session {session_id}")
             
-            # Upload the file using the client
-            audio_file = self.client.files.upload(file=audio_path)
+            # Upload the file using the client - file objects carry no name to infer the type from
+            audio_file = self.client.files.upload(
+                file=audio,
+                config={"mime_type": mime_type} if mime_type else None
+            )
             
             # Transcription prompt with Lithuanian translation
             prompt = """This is a telephone audio conversation. Transcribe it with speaker diarization and timestamps, then translate to Lithuanian.
@@ -180,7 +184,7 @@ Analyze the entire audio and provide complete bilingual transcription."""
                 # Try to parse JSON text if parsed object not available
                 logger.info("Attempting to parse JSON from text response")
                 try:
-                    data = json.loads(response.text)
+                    data = orjson.loads(response.text)
                     # Create TranscriptionResponse from JSON
                     segments = [TranscriptionSegment(**seg) for seg in data["transcription"]]
                     lt_segments = [TranscriptionSegment(**seg) for seg in data.get("lithuanian_transcription", [])]
@@ -7,23 +7,44 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+import importlib.util
+import orjson
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 from google.oauth2 import service_account
 import base64
 from io import BytesIO
 
-# Import services
-try:
-    from gemini_service import get_gemini_analyzer
-    from models import ComprehensiveCallAnalysis
-    from src.services.transcription_service import TranscriptionService
-    from src.models.transcription import TranscriptionResponse
+from src.models.transcription import TranscriptionResponse
+from src.models.analysis import ConversationAnalysisResult
+from app_utils import (
+    get_audio_url,
+    get_file_extension,
+    detect_audio_format,
+    get_signed_audio_url,
+    load_session_index,
+    remember_session_result,
+    transcribe_audio_with_diarization,
+    analyze_transcription_with_gemini,
+    get_session_timeline_figure,
+    get_session_timeline_html,
+    get_session_transcript_html,
+    get_session_speaker_groups_html,
+    get_session_transcription_json,
+    get_session_speaker_statistics,
+    get_session_transcription_text,
+    transcription_version
+)
+
+# app_utils imports the Gemini services lazily, so only check the SDK is installed here
+if importlib.util.find_spec("google.genai") is not None:
     GEMINI_AVAILABLE = "GEMINI_API_KEY" in st.secrets["gcs"] if "gcs" in st.secrets else False
-except Exception as e:
+else:
     GEMINI_AVAILABLE = False
-    print(f"Gemini service not available: {e}")
+    print("Gemini service not available: google-genai is not installed")
 
 st.set_page_config(
     page_title="Call Analytics Platform v2.0", 
@@ -75,7 +96,8 @@ def list_all_sessions(_bucket):
     try:
         # Method 1: Use delimiter to get all session directories (like app.py)
         # This ensures we get ALL sessions, even empty ones
-        blobs = _bucket.list_blobs(prefix="sessions/", delimiter="/")
+        # Partial response - only the prefixes are needed here
+        blobs = _bucket.list_blobs(prefix="sessions/", delimiter="/", fields="prefixes,nextPageToken")
         
         # Get subdirectories (sessions) from prefixes
         for page in blobs.pages:
@@ -89,7 +111,7 @@ def list_all_sessions(_bucket):
         
         # Method 2: Fallback - also check for any files in sessions/ that might have been missed
         # This catches edge cases where sessions might not appear as directories
-        blobs_fallback = _bucket.list_blobs(prefix="sessions/")
+        blobs_fallback = _bucket.list_blobs(prefix="sessions/", fields="items(name),nextPageToken")
         for blob in blobs_fallback:
             # Extract session ID from path like sessions/SESSION_ID/file.json
             parts = blob.name.split('/')
@@ -101,16 +123,36 @@ def list_all_sessions(_bucket):
                     session_info = get_session_metadata(_bucket, session_id)
                     sessions_data.append(session_info)
         
-        return pd.DataFrame(sessions_data)
+        # Build the table column-wise; sessions without analysis lack the metric keys
+        columns = dict.fromkeys(key for info in sessions_data for key in info)
+        return pd.DataFrame({column: [info.get(column) for info in sessions_data] for column in columns})
     except Exception as e:
         st.error(f"Error listing sessions: {e}")
         import traceback
         st.error(traceback.format_exc())
         return pd.DataFrame()
 
-def get_session_metadata(_bucket, session_id):
-    """Extract metadata for a session"""
-    info = {
+# Extensions that mark a session as having audio
+SESSION_AUDIO_EXTENSIONS = frozenset({'wav', 'ogg', 'mp3', 'm4a', 'webm'})
+# Session JSON files read when building session metadata
+SESSION_JSON_FILES = ('metadata.json', 'transcription.json', 'conversation_analysis.json')
+
+def download_blob_bytes(_bucket, blob_path, verify=False):
+    """Download a blob in a single request, returning None if it does not exist
+    
+    Client-side checksum verification is skipped unless verify is set - fine for
+    display-only JSON, where a corrupt read is fixed by the next reload. Set verify for
+    anything that can become Gemini input or be written back to GCS.
+    """
+    blob = _bucket.blob(blob_path)
+    try:
+        return blob.download_as_bytes() if verify else blob.download_as_bytes(checksum=None)
+    except NotFound:
+        return None
+
+def empty_session_metadata(session_id):
+    """Session metadata row before anything is known about the session"""
+    return {
         'Session ID': session_id,
         'Timestamp': None,
         'Has Audio': False,
@@ -125,115 +167,114 @@ def get_session_metadata(_bucket, session_id):
         'Review Priority': None,
         'Review Reasons': []
     }
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def load_session_metadata(_bucket, session_id):
+    """Extract metadata for a session from GCS - cached to avoid re-downloading on every rerun
     
-    try:
-        # Extract timestamp from session ID if possible
-        # Format: 20250822_212315_playground-ONRn-qfMR_500d244a
-        if session_id.startswith('2'):  # Likely starts with year
-            try:
-                # Extract date and time parts
-                parts = session_id.split('_')
-                if len(parts) >= 2:
-                    date_str = parts[0]  # 20250822
-                    time_str = parts[1]  # 212315
-                    # Convert to datetime
-                    datetime_str = f"{date_str}_{time_str}"
-                    info['Timestamp'] = pd.to_datetime(datetime_str, format='%Y%m%d_%H%M%S')
-            except:
-                pass
-        
-        # Check for different file types
-        # First check for specific files
-        specific_files = [
-            (f"sessions/{session_id}/metadata.json", 'Has Metadata'),
-            (f"sessions/{session_id}/events.json", 'Has Events'),
-            (f"sessions/{session_id}/transcription.json", 'Has Transcript')
-        ]
+    GCS errors are raised rather than caught, so st.cache_data doesn't keep a blank row.
+    """
+    info = empty_session_metadata(session_id)
+    
+    # Extract timestamp from session ID if possible
+    # Format: 20250822_212315_playground-ONRn-qfMR_500d244a
+    if session_id.startswith('2'):  # Likely starts with year
+        try:
+            # Extract date and time parts
+            parts = session_id.split('_')
+            if len(parts) >= 2:
+                date_str = parts[0]  # 20250822
+                time_str = parts[1]  # 212315
+                # Convert to datetime
+                datetime_str = f"{date_str}_{time_str}"
+                info['Timestamp'] = pd.to_datetime(datetime_str, format='%Y%m%d_%H%M%S')
+        except:
+            pass
+    
+    # List all files in the session directory
+    prefix = f"sessions/{session_id}/"
+    session_files = load_session_index(_bucket, session_id)
+    for name in session_files:
+        filename = name.split('/')[-1].lower()
         
-        for file_path, key in specific_files:
-            blob = _bucket.blob(file_path)
-            if blob.exists():
-                info[key] = True
+        # Check if it's an audio file
+        if get_file_extension(filename) in SESSION_AUDIO_EXTENSIONS:
+            info['Has Audio'] = True
         
-        # Check for audio files with various patterns
-        audio_patterns = ['recording', 'audio', 'test_audio']
-        audio_extensions = ['.wav', '.ogg', '.mp3', '.m4a', '.webm']
+        # Check for transcript files
+        if 'transcript' in filename or filename == 'transcription.json':
+            info['Has Transcript'] = True
         
-        # List all files in the session directory
-        blobs = _bucket.list_blobs(prefix=f"sessions/{session_id}/")
-        for blob in blobs:
-            filename = blob.name.split('/')[-1].lower()
+        # Check for analysis files
+        if 'analysis' in filename:
+            info['Has Analysis'] = True
+    
+    # Specific files are known from the listing - no exists() round-trips needed
+    info['Has Metadata'] = 'metadata.json' in session_files
+    info['Has Events'] = 'events.json' in session_files
+    info['Has Transcript'] = info['Has Transcript'] or 'transcription.json' in session_files
+    
+    # Download the JSON files that exist concurrently
+    json_files = [name for name in SESSION_JSON_FILES if name in session_files]
+    with ThreadPoolExecutor(max_workers=len(SESSION_JSON_FILES)) as executor:
+        contents = dict(zip(json_files, executor.map(
+            lambda name: download_blob_bytes(_bucket, f"{prefix}{name}"), json_files
+        )))
+    
+    # Try to get additional metadata
+    if contents.get('metadata.json'):
+        metadata = orjson.loads(contents['metadata.json'])
+        info['Duration'] = metadata.get('duration')
+        info['Language'] = metadata.get('language', metadata.get('original_language'))
+    
+    # Try to get transcription metadata
+    if contents.get('transcription.json'):
+        trans_data = orjson.loads(contents['transcription.json'])
+        info['Duration'] = info['Duration'] or trans_data.get('total_duration')
+        info['Language'] = info['Language'] or trans_data.get('original_language')
+    
+    # Check for AI analysis results and review requirements
+    if contents.get('conversation_analysis.json'):
+        try:
+            analysis_data = orjson.loads(contents['conversation_analysis.json'])
+            info['Has Analysis'] = True
+            info['Needs Review'] = analysis_data.get('requires_review', False)
+            info['Review Priority'] = analysis_data.get('review_priority', None)
+            info['Review Reasons'] = analysis_data.get('review_reasons', [])
             
-            # Check if it's an audio file
-            for pattern in audio_patterns:
-                if pattern in filename:
-                    for ext in audio_extensions:
-                        if filename.endswith(ext):
-                            info['Has Audio'] = True
-                            break
-                if info['Has Audio']:
-                    break
+            # Debug logging for specific session
+            if session_id == "20250904_180344_custom_empathy":
+                print(f"DEBUG: Loading {session_id} from GCS - Review Priority: {info['Review Priority']}")
             
-            # Also check for any file with audio extension
-            if not info['Has Audio']:
-                for ext in audio_extensions:
-                    if filename.endswith(ext):
-                        info['Has Audio'] = True
-                        break
+            # Add analysis metrics
+            info['Structure Score'] = analysis_data.get('structure_analysis', {}).get('structure_score', None)
+            info['Pause Compliance'] = analysis_data.get('pause_compliance_score', None)
+            info['Unresolved Issues'] = len(analysis_data.get('unresolved_issues', []))
+            info['Politeness Score'] = analysis_data.get('politeness_score', None)
+            info['Satisfaction'] = analysis_data.get('final_satisfaction', None)
             
-            # Check for transcript files
-            if 'transcript' in filename or filename == 'transcription.json':
-                info['Has Transcript'] = True
+            # Get conversation category
+            info['Category'] = analysis_data.get('conversation_category', None)
             
-            # Check for analysis files
-            if 'analysis' in filename:
-                info['Has Analysis'] = True
-        
-        # Try to get additional metadata
-        metadata_blob = _bucket.blob(f"sessions/{session_id}/metadata.json")
-        if metadata_blob.exists():
-            metadata = json.loads(metadata_blob.download_as_text())
-            info['Duration'] = metadata.get('duration')
-            info['Language'] = metadata.get('language', metadata.get('original_language'))
-        
-        # Try to get transcription metadata
-        trans_blob = _bucket.blob(f"sessions/{session_id}/transcription.json")
-        if trans_blob.exists():
-            trans_data = json.loads(trans_blob.download_as_text())
-            info['Duration'] = info['Duration'] or trans_data.get('total_duration')
-            info['Language'] = info['Language'] or trans_data.get('original_language')
-        
-        # Check for AI analysis results and review requirements
-        analysis_blob = _bucket.blob(f"sessions/{session_id}/conversation_analysis.json")
-        if analysis_blob.exists():
-            try:
-                analysis_data = json.loads(analysis_blob.download_as_text())
-                info['Has Analysis'] = True
-                info['Needs Review'] = analysis_data.get('requires_review', False)
-                info['Review Priority'] = analysis_data.get('review_priority', None)
-                info['Review Reasons'] = analysis_data.get('review_reasons', [])
-                
-                # Debug logging for specific session
-                if session_id == "20250904_180344_custom_empathy":
-                    print(f"DEBUG: Loading {session_id} from GCS - Review Priority: {info['Review Priority']}")
-                
-                # Add analysis metrics
-                info['Structure Score'] = analysis_data.get('structure_analysis', {}).get('structure_score', None)
-                info['Pause Compliance'] = analysis_data.get('pause_compliance_score', None)
-                info['Unresolved Issues'] = len(analysis_data.get('unresolved_issues', []))
-                info['Politeness Score'] = analysis_data.get('politeness_score', None)
-                info['Satisfaction'] = analysis_data.get('final_satisfaction', None)
-                
-                # Get conversation category
-                info['Category'] = analysis_data.get('conversation_category', None)
-                
-                # Get emotional tone
-                tone_eval = analysis_data.get('tone_evaluation', {})
-                info['Customer Tone'] = tone_eval.get('customer_tone', None)
-                info['Agent Tone'] = tone_eval.get('agent_tone', None)
-            except:
-                pass
-        
+            # Get emotional tone
+            tone_eval = analysis_data.get('tone_evaluation', {})
+            info['Customer Tone'] = tone_eval.get('customer_tone', None)
+            info['Agent Tone'] = tone_eval.get('agent_tone', None)
+        except:
+            pass
+    
+    return info
+
+def get_session_metadata(_bucket, session_id):
+    """Extract metadata for a session"""
+    # st.cache_data returns a copy, so the session state overlay below is safe
+    try:
+        info = load_session_metadata(_bucket, session_id)
+    except Exception:
+        # Not cached, so the next rerun tries GCS again
+        info = empty_session_metadata(session_id)
+    
+    try:
         # Also check session state for analysis (in case it's not saved to GCS yet)
         analysis_key = f"conversation_analysis_{session_id}"
         if analysis_key in st.session_state:
@@ -675,6 +716,38 @@ def display_session_table(df):
     
     return filtered_df
 
+def prefetch_session_results(bucket, session_id):
+    """Download the transcription and analysis of a session concurrently
+    
+    The transcription and analysis tabs would otherwise each fetch their file in turn
+    while rendering. Results land in session_state, where the tabs look first; a file
+    that fails to load here is retried by its tab, which reports the error.
+    """
+    result_files = {
+        f"transcription_{session_id}": ("transcription.json", TranscriptionResponse),
+        f"conversation_analysis_{session_id}": ("conversation_analysis.json", ConversationAnalysisResult)
+    }
+    session_files = load_session_index(bucket, session_id)
+    pending = {
+        key: result for key, result in result_files.items()
+        if key not in st.session_state and result[0] in session_files
+    }
+    if not pending:
+        return
+    
+    prefix = f"sessions/{session_id}/"
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        contents = executor.map(
+            # Verified - a prefetched transcription can be sent on to Gemini for analysis
+            lambda result: download_blob_bytes(bucket, f"{prefix}{result[0]}", verify=True), pending.values()
+        )
+        for (key, (_, model)), content in zip(pending.items(), contents):
+            if content:
+                try:
+                    remember_session_result(key, model(**orjson.loads(content)))
+                except Exception:
+                    pass
+
 def display_session_details(bucket, session_id):
     """Display detailed view for a selected session"""
     
@@ -688,13 +761,8 @@ def display_session_details(bucket, session_id):
             st.session_state.selected_session = None
             st.rerun()
     
-    # Import all the functions from original app
-    from app_utils import (
-        get_audio_url,
-        transcribe_audio_with_diarization,
-        analyze_audio_with_gemini,
-        create_speaker_timeline_html
-    )
+    # Fetch what the tabs need in one round trip rather than tab by tab
+    prefetch_session_results(bucket, session_id)
     
     # Get session metadata
     session_info = get_session_metadata(bucket, session_id)
@@ -718,6 +786,7 @@ def display_session_details(bucket, session_id):
             st.info("**Date:** Unknown")
     
     # Create tabs for different features
+    # Interactive tabs are fragments, so widgets only rerun their own tab
     tabs = st.tabs([
         "🎙️ Transcription & Translation",
         "🎵 Audio Player",
@@ -746,13 +815,9 @@ def display_session_details(bucket, session_id):
     with tabs[4]:
         display_raw_data_tab(bucket, session_id)
 
+@st.fragment
 def display_transcription_tab(bucket, session_id):
     """Display transcription with all features from v1"""
-    import json
-    from app_utils import transcribe_audio_with_diarization, get_audio_url, create_speaker_timeline_html
-    from src.services.transcription_service import TranscriptionService
-    from src.models.transcription import TranscriptionResponse
-    
     st.markdown("### 🎙️ Transcription with Speaker Diarization")
     
     # Check if transcription exists
@@ -760,11 +825,11 @@ def display_transcription_tab(bucket, session_id):
     
     # Try to load existing transcription from GCS if not in session state
     if transcription_key not in st.session_state:
-        transcription_blob = bucket.blob(f"sessions/{session_id}/transcription.json")
-        if transcription_blob.exists():
+        if "transcription.json" in load_session_index(bucket, session_id):
+            transcription_blob = bucket.blob(f"sessions/{session_id}/transcription.json")
             try:
-                trans_data = json.loads(transcription_blob.download_as_text())
-                st.session_state[transcription_key] = TranscriptionResponse(**trans_data)
+                trans_data = orjson.loads(transcription_blob.download_as_bytes())
+                remember_session_result(transcription_key, TranscriptionResponse(**trans_data))
             except Exception as e:
                 st.warning(f"Could not load existing transcription: {e}")
     
@@ -778,6 +843,7 @@ def display_transcription_tab(bucket, session_id):
             transcription = transcribe_audio_with_diarization(bucket, session_id, force_regenerate=True)
             if transcription:
                 st.success("✅ Transcription completed!")
+                load_session_metadata.clear()
                 st.rerun()
     
     with col2:
@@ -791,6 +857,7 @@ def display_transcription_tab(bucket, session_id):
     # Display transcription if available
     if transcription_key in st.session_state:
         transcription: TranscriptionResponse = st.session_state[transcription_key]
+        version = transcription_version(transcription)
         
         # Add audio player with timeline
         st.markdown("#### 🎵 Audio Player with Speaker Timeline")
@@ -802,15 +869,7 @@ def display_transcription_tab(bucket, session_id):
             audio_container = st.container()
             with audio_container:
                 # Determine audio format from the stored filename
-                audio_format = 'audio/wav'  # Default to WAV
-                if f"audio_format_{session_id}" in st.session_state:
-                    filename = st.session_state[f"audio_format_{session_id}"]
-                    if filename.endswith('.ogg'):
-                        audio_format = 'audio/ogg'
-                    elif filename.endswith('.mp3'):
-                        audio_format = 'audio/mpeg'
-                    elif filename.endswith('.wav'):
-                        audio_format = 'audio/wav'
+                audio_format, _ = detect_audio_format(session_id)
                 
                 # Display audio player with the correct format
                 st.audio(audio_url, format=audio_format)
@@ -820,14 +879,13 @@ def display_transcription_tab(bucket, session_id):
                 
                 # Try to use Plotly for better visualization
                 try:
-                    from src.utils.timeline_viz import create_speaker_timeline_plotly
-                    fig = create_speaker_timeline_plotly(transcription)
+                    fig = get_session_timeline_figure(session_id, version, transcription)
                     st.plotly_chart(fig, use_container_width=True)
                 except ImportError:
                     # Fallback to HTML if Plotly not available
                     col1, col2 = st.columns([3, 1])
                     with col1:
-                        timeline_html = create_speaker_timeline_html(transcription)
+                        timeline_html = get_session_timeline_html(session_id, version, transcription)
                         st.markdown(timeline_html, unsafe_allow_html=True)
                     with col2:
                         st.info("🎯 **Timeline Guide:**\n\n"
@@ -847,21 +905,20 @@ def display_transcription_tab(bucket, session_id):
         with col3:
             st.metric("Segments", len(transcription.transcription))
         
-        # Get speaker statistics
-        transcription_service = TranscriptionService()
-        speaker_stats = transcription_service.get_speaker_statistics(transcription)
+        # Get speaker statistics - computed once per session transcription
+        speaker_stats = get_session_speaker_statistics(session_id, version, transcription)
         
         # Display speaker breakdown
-        if speaker_stats:
+        if not speaker_stats.empty:
             st.markdown("#### Speaker Statistics")
-            for speaker, stats in speaker_stats.items():
+            for stats in speaker_stats.itertuples(index=False):
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.info(f"**{speaker.upper()}**")
+                    st.info(f"**{stats.speaker.upper()}**")
                 with col2:
-                    st.info(f"Time: {stats['total_time']:.1f}s")
+                    st.info(f"Time: {stats.total_time:.1f}s")
                 with col3:
-                    st.info(f"Words: {stats['words']}")
+                    st.info(f"Words: {stats.words}")
         
         # Display full transcription with different views
         st.markdown("#### Full Transcription")
@@ -887,120 +944,24 @@ def display_transcription_tab(bucket, session_id):
             
             with col_left:
                 st.markdown(f"##### 🌍 Original ({transcription.original_language})")
-                # Use native Streamlit components in a container
-                with st.container():
-                    for seg in transcription.transcription:
-                        if seg.speaker_label != "silence":
-                            # Choose color based on speaker
-                            if "speaker1" in seg.speaker_label:
-                                color = "#4CAF50"
-                            elif "speaker2" in seg.speaker_label:
-                                color = "#2196F3"
-                            else:
-                                color = "#666666"
-                            
-                            # Format timestamp and speaker
-                            col_time, col_speaker = st.columns([2, 5])
-                            with col_time:
-                                st.caption(f"[{seg.timestamp_start:.1f}s - {seg.timestamp_end:.1f}s]")
-                            with col_speaker:
-                                st.markdown(f"<span style='color: {color}; font-weight: bold;'>{seg.speaker_label.upper()}</span>", unsafe_allow_html=True)
-                            st.write(seg.text)
-                            st.divider()
-                        else:
-                            duration = seg.timestamp_end - seg.timestamp_start
-                            if duration > 2:
-                                st.caption(f"— Silence ({duration:.1f}s) —")
+                st.markdown(get_session_transcript_html(session_id, version, transcription), unsafe_allow_html=True)
             
             with col_right:
                 st.markdown("##### 🇱🇹 Lithuanian Translation")
-                # Use native Streamlit components in a container
-                with st.container():
-                    for seg in transcription.lithuanian_transcription:
-                        if seg.speaker_label != "silence":
-                            # Choose color based on speaker
-                            if "speaker1" in seg.speaker_label:
-                                color = "#4CAF50"
-                            elif "speaker2" in seg.speaker_label:
-                                color = "#2196F3"
-                            else:
-                                color = "#666666"
-                            
-                            # Format timestamp and speaker
-                            col_time, col_speaker = st.columns([2, 5])
-                            with col_time:
-                                st.caption(f"[{seg.timestamp_start:.1f}s - {seg.timestamp_end:.1f}s]")
-                            with col_speaker:
-                                st.markdown(f"<span style='color: {color}; font-weight: bold;'>{seg.speaker_label.upper()}</span>", unsafe_allow_html=True)
-                            st.write(seg.text)
-                            st.divider()
-                        else:
-                            duration = seg.timestamp_end - seg.timestamp_start
-                            if duration > 2:
-                                st.caption(f"— Tyla ({duration:.1f}s) —")
+                st.markdown(get_session_transcript_html(session_id, version, transcription, use_lithuanian=True), unsafe_allow_html=True)
             
             st.info("💡 Tip: Both columns are synchronized by timestamps. Scroll to compare translations.")
             
         elif transcript_view == "Interactive":
-            # Create interactive transcript using Streamlit components
+            # Render the whole transcript as one HTML block instead of widgets per segment
             st.markdown("---")
-            for segment in transcription.transcription:
-                if segment.speaker_label != "silence":
-                    # Choose color based on speaker
-                    if "speaker1" in segment.speaker_label:
-                        color = "#4CAF50"
-                    elif "speaker2" in segment.speaker_label:
-                        color = "#2196F3"
-                    elif "speaker3" in segment.speaker_label:
-                        color = "#FF9800"
-                    elif "speaker4" in segment.speaker_label:
-                        color = "#9C27B0"
-                    elif "speaker5" in segment.speaker_label:
-                        color = "#F44336"
-                    else:
-                        color = "#666666"
-                    
-                    # Create columns for timestamp, speaker, and text
-                    col1, col2, col3 = st.columns([1, 1, 5])
-                    with col1:
-                        st.markdown(f"**[{segment.timestamp_start:.1f}s - {segment.timestamp_end:.1f}s]**")
-                    with col2:
-                        st.markdown(f"<span style='color: {color}; font-weight: bold;'>{segment.speaker_label.upper()}</span>", unsafe_allow_html=True)
-                    with col3:
-                        st.write(segment.text)
-                else:
-                    # Show silence periods
-                    duration = segment.timestamp_end - segment.timestamp_start
-                    if duration > 2:  # Only show significant silences
-                        st.markdown(f"*— Silence ({duration:.1f}s) —*", unsafe_allow_html=False)
+            st.markdown(get_session_transcript_html(session_id, version, transcription), unsafe_allow_html=True)
             st.markdown("---")
             st.info("💡 Tip: Timestamps are displayed for reference. Audio seeking requires manual navigation in the player above.")
             
         elif transcript_view == "Expandable":
             # Expandable view with segments grouped by speaker
-            current_speaker = None
-            segments_group = []
-            
-            for segment in transcription.transcription:
-                if segment.speaker_label != "silence":
-                    if current_speaker != segment.speaker_label:
-                        # Display previous group if exists
-                        if segments_group and current_speaker:
-                            with st.expander(f"{current_speaker.upper()} - {len(segments_group)} segment(s)", expanded=False):
-                                for seg in segments_group:
-                                    st.write(f"**[{seg.timestamp_start:.1f}s - {seg.timestamp_end:.1f}s]** {seg.text}")
-                        
-                        # Start new group
-                        current_speaker = segment.speaker_label
-                        segments_group = [segment]
-                    else:
-                        segments_group.append(segment)
-            
-            # Display last group
-            if segments_group and current_speaker:
-                with st.expander(f"{current_speaker.upper()} - {len(segments_group)} segment(s)", expanded=False):
-                    for seg in segments_group:
-                        st.write(f"**[{seg.timestamp_start:.1f}s - {seg.timestamp_end:.1f}s]** {seg.text}")
+            st.markdown(get_session_speaker_groups_html(session_id, version, transcription), unsafe_allow_html=True)
         else:
             # Plain text view
             if has_lithuanian:
@@ -1012,25 +973,14 @@ def display_transcription_tab(bucket, session_id):
                     key=f"text_lang_{session_id}"
                 )
                 use_lithuanian = text_lang == "Lithuanian"
-                formatted_text = transcription_service.get_transcription_text(transcription, use_lithuanian=use_lithuanian)
+                formatted_text = get_session_transcription_text(session_id, version, transcription, use_lithuanian=use_lithuanian)
                 st.text_area(f"Transcription ({text_lang})", formatted_text, height=400)
             else:
-                formatted_text = transcription_service.get_transcription_text(transcription)
+                formatted_text = get_session_transcription_text(session_id, version, transcription)
                 st.text_area("Transcription", formatted_text, height=400)
         
         # Download button
-        download_data = {
-            "session_id": session_id,
-            "total_duration": transcription.total_duration,
-            "num_speakers": transcription.num_speakers,
-            "original_language": transcription.original_language if has_lithuanian else "unknown",
-            "transcription": [seg.model_dump() for seg in transcription.transcription]
-        }
-        
-        # Add Lithuanian if available
-        if has_lithuanian:
-            download_data["lithuanian_transcription"] = [seg.model_dump() for seg in transcription.lithuanian_transcription]
-        content = json.dumps(download_data, indent=2)
+        content = get_session_transcription_json(session_id, version, transcription)
         
         st.download_button(
             label="📥 Download Transcription JSON",
@@ -1039,23 +989,16 @@ def display_transcription_tab(bucket, session_id):
             mime="application/json"
         )
 
+@st.fragment
 def display_audio_tab(bucket, session_id):
     """Display audio player and controls"""
-    from app_utils import get_audio_url
-    
     st.markdown("### 🎵 Audio Recording")
     
     audio_url = get_audio_url(bucket, session_id)
     
     if audio_url:
         # Determine audio format
-        audio_format = 'audio/wav'  # Default
-        if f"audio_format_{session_id}" in st.session_state:
-            filename = st.session_state[f"audio_format_{session_id}"]
-            if filename.endswith('.ogg'):
-                audio_format = 'audio/ogg'
-            elif filename.endswith('.mp3'):
-                audio_format = 'audio/mpeg'
+        audio_format, audio_extension = detect_audio_format(session_id)
         
         st.audio(audio_url, format=audio_format)
         
@@ -1066,7 +1009,7 @@ def display_audio_tab(bucket, session_id):
             st.download_button(
                 label="📥 Download Audio",
                 data=audio_url,
-                file_name=f"{session_id}_audio.{audio_format.split('/')[-1]}",
+                file_name=f"{session_id}_audio.{audio_extension}",
                 mime=audio_format
             )
     else:
@@ -1111,8 +1054,10 @@ def display_audio_tab(bucket, session_id):
                         st.success(f"✅ Audio file uploaded successfully as {audio_filename}")
                         
                         # Clear cache to reflect the change
-                        if f"audio_format_{session_id}" in st.session_state:
-                            del st.session_state[f"audio_format_{session_id}"]
+                        st.session_state.pop(f"audio_format_{session_id}", None)
+                        load_session_index.clear()
+                        get_signed_audio_url.clear()
+                        load_session_metadata.clear()
                         
                         # Rerun to refresh the page
                         st.rerun()
@@ -1120,12 +1065,9 @@ def display_audio_tab(bucket, session_id):
                 except Exception as e:
                     st.error(f"❌ Failed to upload audio: {e}")
 
+@st.fragment
 def display_analysis_tab(bucket, session_id):
     """Display AI analysis results"""
-    import json
-    from app_utils import analyze_transcription_with_gemini
-    from src.models.analysis import ConversationAnalysisResult
-    
     st.markdown("### 🤖 Conversation Analysis")
     st.markdown("##### Pause Compliance & Resolution Detection")
     
@@ -1135,22 +1077,21 @@ def display_analysis_tab(bucket, session_id):
     
     # Try to load existing analysis from GCS if not in session state
     if analysis_key not in st.session_state:
-        analysis_blob = bucket.blob(f"sessions/{session_id}/conversation_analysis.json")
-        if analysis_blob.exists():
+        if "conversation_analysis.json" in load_session_index(bucket, session_id):
+            analysis_blob = bucket.blob(f"sessions/{session_id}/conversation_analysis.json")
             try:
-                analysis_data = json.loads(analysis_blob.download_as_text())
-                st.session_state[analysis_key] = ConversationAnalysisResult(**analysis_data)
+                analysis_data = orjson.loads(analysis_blob.download_as_bytes(checksum=None))
+                remember_session_result(analysis_key, ConversationAnalysisResult(**analysis_data))
             except Exception as e:
                 st.warning(f"Could not load existing analysis: {e}")
     
     # Also try to load transcription if not in session state
     if transcription_key not in st.session_state:
-        transcription_blob = bucket.blob(f"sessions/{session_id}/transcription.json")
-        if transcription_blob.exists():
+        if "transcription.json" in load_session_index(bucket, session_id):
+            transcription_blob = bucket.blob(f"sessions/{session_id}/transcription.json")
             try:
-                from src.models.transcription import TranscriptionResponse
-                trans_data = json.loads(transcription_blob.download_as_text())
-                st.session_state[transcription_key] = TranscriptionResponse(**trans_data)
+                trans_data = orjson.loads(transcription_blob.download_as_bytes())
+                remember_session_result(transcription_key, TranscriptionResponse(**trans_data))
             except Exception as e:
                 pass  # Silent fail, will show warning below
     
@@ -1166,6 +1107,7 @@ def display_analysis_tab(bucket, session_id):
             if st.button(button_label, type="primary"):
                 analysis = analyze_transcription_with_gemini(session_id, force_regenerate=True)
                 if analysis:
+                    load_session_metadata.clear()
                     st.rerun()
         
         with col2:
@@ -1562,31 +1504,34 @@ def display_metadata_tab(bucket, session_id):
     st.markdown("### 📊 Session Metadata")
     
     try:
-        metadata_blob = bucket.blob(f"sessions/{session_id}/metadata.json")
-        if metadata_blob.exists():
-            metadata = json.loads(metadata_blob.download_as_text())
+        if "metadata.json" in load_session_index(bucket, session_id):
+            metadata_blob = bucket.blob(f"sessions/{session_id}/metadata.json")
+            metadata = orjson.loads(metadata_blob.download_as_bytes(checksum=None))
             st.json(metadata)
         else:
             st.info("No metadata file found")
     except Exception as e:
         st.error(f"Error loading metadata: {e}")
 
+def list_session_files(_bucket, session_id):
+    """List files of a session as a DataFrame built from the cached session index"""
+    index = load_session_index(_bucket, session_id)
+    
+    # Build the table column-wise instead of one dict per blob
+    return pd.DataFrame({
+        'File': list(index),
+        'Size': [f"{info['size'] / 1024:.1f} KB" if info['size'] else "0 KB" for info in index.values()],
+        'Updated': [info['updated'].strftime("%Y-%m-%d %H:%M") if info['updated'] else "Unknown" for info in index.values()]
+    })
+
 def display_raw_data_tab(bucket, session_id):
     """Display raw files for the session"""
     st.markdown("### 📄 Raw Session Files")
     
     try:
-        blobs = bucket.list_blobs(prefix=f"sessions/{session_id}/")
-        files = []
-        for blob in blobs:
-            files.append({
-                'File': blob.name.replace(f"sessions/{session_id}/", ""),
-                'Size': f"{blob.size / 1024:.1f} KB" if blob.size else "0 KB",
-                'Updated': blob.updated.strftime("%Y-%m-%d %H:%M") if blob.updated else "Unknown"
-            })
+        df = list_session_files(bucket, session_id)
         
-        if files:
-            df = pd.DataFrame(files)
+        if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
         else:
             st.info("No files found")
@@ -1713,8 +1658,6 @@ def main():
                             st.write(f"... and {len(session_list) - 10} more")
                         
                         if st.button("🚀 Start Bulk Transcription", type="primary"):
-                            from app_utils import transcribe_audio_with_diarization
-                            
                             # Progress tracking
                             progress_bar = st.progress(0)
                             status_text = st.empty()
@@ -1773,8 +1716,6 @@ def main():
                         st.write(f"... and {len(analysis_list) - 10} more")
                     
                     if st.button("🚀 Start Bulk Analysis", type="primary", key="bulk_analysis_btn"):
-                        from app_utils import analyze_transcription_with_gemini
-                        
                         # Progress tracking
                         progress_bar = st.progress(0)
                         status_text = st.empty()